@@ -6,6 +6,7 @@ from fastapi.middleware.cors import CORSMiddleware
 # Import routers
 from routers.gist_api import router as gist_router
 from routers.score_api import router as score_router
+from services import llm_client, jd_fetcher, score_engine
 
 app = FastAPI(
     title="Extension Backend - Gist & Resume Score",
@@ -35,6 +36,13 @@ app.add_middleware(
 app.include_router(gist_router, prefix="")
 app.include_router(score_router, prefix="")
 
+@app.on_event("shutdown")
+async def shutdown():
+    # close the pooled LLM / JD fetch HTTP sessions
+    await llm_client.close_session()
+    await jd_fetcher.close_session()
+    score_engine.shutdown_executor()
+
 @app.get("/health")
 async def health():
     return {"status": "healthy", "version": "1.0.0"}
@@ -4,8 +4,10 @@ from pydantic import BaseModel
 from typing import Optional, Dict, Any
 from services import score_engine, jd_fetcher
 from loguru import logger
+import asyncio
 import os
 import time
+import traceback
 
 router = APIRouter()
 
@@ -38,12 +40,15 @@ async def resume_score_endpoint(req: ScoreRequest):
         jd_sections = {}
         jd_full_text = ""
 
-        logger.info(f"📥 Received resume score request (resume length: {len(str(parsed_resume))} chars)")
+        # ⚡ Lazy: str(parsed_resume) reprs the whole resume, only build it if INFO is emitted
+        logger.opt(lazy=True).info("📥 Received resume score request (resume length: {} chars)", lambda: len(str(parsed_resume)))
 
         if req.jd_url:
+            # ⚡ Embed the resume while the JD downloads instead of after it
+            prewarm = asyncio.create_task(score_engine.prewarm_resume_embedding(parsed_resume))
             try:
                 logger.info(f"🔗 Fetching JD from: {req.jd_url}")
-                jd_res = jd_fetcher.fetch_job_description(req.jd_url)
+                jd_res = await jd_fetcher.fetch_job_description_async(req.jd_url)
                 if jd_res and isinstance(jd_res, dict):
                     jd_sections = jd_res.get("jd_sections", {})
                     jd_full_text = jd_res.get("job_description_full", "")
@@ -58,6 +63,7 @@ async def resume_score_endpoint(req: ScoreRequest):
                 logger.warning(f"⚠️ JD fetch failed for {req.jd_url}: {fetch_err}")
                 jd_sections = {}
                 jd_full_text = ""
+            await prewarm
         else:
             jd_full_text = req.job_description or ""
             logger.info(f"📄 Using provided JD text ({len(jd_full_text)} chars)")
@@ -74,6 +80,5 @@ async def resume_score_endpoint(req: ScoreRequest):
     except Exception as e:
         total_duration = time.time() - start_time
         logger.error(f"❌ Score computation failed after {total_duration:.2f}s: {e}")
-        import traceback
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=str(e))
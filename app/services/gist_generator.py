@@ -1,7 +1,13 @@
 # services/gist_generator.py
+import os
+import asyncio
+import functools
 import re
 import json
-from typing import Dict, List, Any
+import hashlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
 from loguru import logger
 
 try:
@@ -21,6 +27,10 @@ def trim_text(text: str, max_chars: int = 4000) -> str:
     text = str(text).strip()
     return text[:max_chars] + "..." if len(text) > max_chars else text
 
+_fence_json_re = re.compile(r'```json\s*')
+_fence_re = re.compile(r'```\s*')
+_json_object_re = re.compile(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', re.DOTALL)
+
 def safe_parse_gist_output(response_text: str) -> Dict[str, str]:
     """
     Safely parse LLM output; handles non-JSON text by attempting fallback parsing.
@@ -38,8 +48,8 @@ def safe_parse_gist_output(response_text: str) -> Dict[str, str]:
         # Try to extract JSON from markdown code blocks
         json_str = response_text.strip()
         if json_str.startswith("```"):
-            json_str = re.sub(r'```json\s*', '', json_str)
-            json_str = re.sub(r'```\s*', '', json_str)
+            json_str = _fence_json_re.sub('', json_str)
+            json_str = _fence_re.sub('', json_str)
             json_str = json_str.strip()
             try:
                 return json.loads(json_str)
@@ -47,7 +57,7 @@ def safe_parse_gist_output(response_text: str) -> Dict[str, str]:
                 pass
         
         # Try to find JSON object in response
-        json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', response_text, re.DOTALL)
+        json_match = _json_object_re.search(response_text)
         if json_match:
             try:
                 return json.loads(json_match.group(0))
@@ -96,6 +106,20 @@ _email_re = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
 _phone_re = re.compile(r'(\+?\d{1,3}[\s-]?)?\(?\d{1,4}\)?[\s-]?\d{1,4}[\s-]?\d{1,9}')
 _link_re = re.compile(r'(https?://[^\s]+)')
 _name_heuristics_re = re.compile(r'^[A-Z][a-z]+\s+[A-Z][a-z]+')  # naive first-last
+_phone_simple_re = re.compile(r'\+?\d{10,15}')
+_phone_punct_re = re.compile(r'[\s\-\(\)]+')
+_phone_long_re = re.compile(r'\+?\d{10,}')
+_phone_cc_re = re.compile(r'\+(\d{1,3})')
+_year_any_re = re.compile(r'(19|20)\d{2}')
+# City, State
+_city_state_re = re.compile(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),\s*([A-Z]{2}|[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)')
+# City, State, Country
+_city_state_country_re = re.compile(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),\s*([A-Z]{2}|[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)')
+_location_tail_re = re.compile(r'\s+(Software|Developer|Engineer|Manager|Experience|Frontend|Backend|Full|Stack).*$', re.IGNORECASE)
+_location_tail_short_re = re.compile(r'\s+(Software|Developer|Engineer|Manager|Experience|Frontend|Backend).*$', re.IGNORECASE)
+_non_word_re = re.compile(r'[^\w]')
+_india_re = re.compile(r'\bindia\b')  # matched against lowercased text
+_snippet_split_re = re.compile(r'[\n\r]+|\.\s+')
 
 def extract_email(text: str):
     m = _email_re.search(text)
@@ -107,7 +131,7 @@ def extract_phone(text: str):
     matches = list(_phone_re.finditer(text))
     if not matches:
         # Fallback: try simpler pattern for international numbers
-        simple_match = re.search(r'\+?\d{10,15}', text.replace(' ', '').replace('-', ''))
+        simple_match = _phone_simple_re.search(text.replace(' ', '').replace('-', ''))
         if simple_match:
             return simple_match.group(0)
         return None
@@ -116,7 +140,7 @@ def extract_phone(text: str):
     best_match = None
     best_length = 0
     for m in matches:
-        phone_str = re.sub(r'[\s\-\(\)]+', '', m.group(0))
+        phone_str = _phone_punct_re.sub('', m.group(0))
         # Prefer matches with 10+ digits (complete phone numbers)
         if len(phone_str) >= 10 and len(phone_str) > best_length:
             best_match = phone_str
@@ -126,7 +150,7 @@ def extract_phone(text: str):
         return best_match
     
     # If no good match, return the first one cleaned up
-    phone_str = re.sub(r'[\s\-\(\)]+', '', matches[0].group(0))
+    phone_str = _phone_punct_re.sub('', matches[0].group(0))
     return phone_str if len(phone_str) >= 10 else None
 
 def extract_links(text: str):
@@ -138,9 +162,10 @@ def extract_name_from_text(text: str):
     if not lines:
         return None
     # Look at first 6 lines for a name-like pattern
+    # (name_like splits once and enforces the 2-4 word limit)
     for ln in lines[:6]:
-        if len(ln.split()) <= 4 and name_like(ln):
-            return ln.strip()
+        if name_like(ln):
+            return ln
     # fallback to regex
     m = _name_heuristics_re.search(text or "")
     return m.group(0).strip() if m else None
@@ -155,13 +180,14 @@ def name_like(s: str):
             return False
     return True
 
-def extract_location(text: str):
+def extract_location(text: str, lines: Optional[List[str]] = None):
     """Extract location (city, state) from resume - prioritize header, STRICTLY avoid work experience"""
     if not text:
         return None
     
-    # Split text into lines
-    lines = text.split('\n')
+    # Split text into lines (callers that already split the text can pass them in)
+    if lines is None:
+        lines = text.split('\n')
     
     # Priority 1: Look ONLY in header/contact section (first 8 lines) - before any work experience
     # Stop at first occurrence of work experience keywords
@@ -172,7 +198,7 @@ def extract_location(text: str):
         if any(keyword in line_lower for keyword in ['work experience', 'employment', 'professional experience', 'career', 'experience:']):
             break
         # Skip if it looks like work experience entry (has dates, job titles)
-        if re.search(r'(19|20)\d{2}', line) and any(word in line_lower for word in ['developer', 'engineer', 'manager', 'software', 'analyst', 'consultant']):
+        if _year_any_re.search(line) and any(word in line_lower for word in ['developer', 'engineer', 'manager', 'software', 'analyst', 'consultant']):
             continue
         header_lines.append(line)
     
@@ -182,57 +208,64 @@ def extract_location(text: str):
     for line in header_lines:
         line = line.strip()
         # Skip if it looks like a name, email, phone, or link
-        if '@' in line or 'http' in line.lower() or re.search(r'\+?\d{10,}', line):
+        if '@' in line or 'http' in line.lower() or _phone_long_re.search(line):
             continue
         # Skip if too long (likely not location)
         if len(line.split()) > 4:
             continue
         # Check if it contains location-like patterns (City, State)
-        location_match = re.search(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),\s*([A-Z]{2}|[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)', line)
+        location_match = _city_state_re.search(line)
         if location_match:
             location_str = location_match.group(0).strip()
             # Remove any trailing text that's not part of location
-            location_str = re.sub(r'\s+(Software|Developer|Engineer|Manager|Experience|Frontend|Backend|Full|Stack).*$', '', location_str, flags=re.IGNORECASE)
+            location_str = _location_tail_re.sub('', location_str)
             # Don't return if it contains work-related keywords
             if not any(word in location_str.lower() for word in ['software', 'developer', 'engineer', 'manager']):
                 return location_str.strip()
     
     # Priority 2: Look for location patterns in header text (without work keywords)
-    location_patterns = [
-        r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),\s*([A-Z]{2}|[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',  # City, State
-    ]
-    
-    for pattern in location_patterns:
-        matches = list(re.finditer(pattern, header_text))
-        for m in matches:
-            location_str = m.group(0).strip()
-            # Don't return if it's clearly from work experience
-            context_start = max(0, m.start() - 50)
-            context_end = min(len(header_text), m.end() + 50)
-            context = header_text[context_start:context_end].lower()
-            if any(word in context for word in ['software', 'developer', 'engineer', 'manager', 'experience', 'lyric', 'startup']):
-                continue
-            # Clean up - remove any trailing job-related text
-            location_str = re.sub(r'\s+(Software|Developer|Engineer|Manager|Experience|Frontend|Backend).*$', '', location_str, flags=re.IGNORECASE)
-            return location_str.strip()
+    # ⚡ Lazy scan: stops at the first acceptable match instead of collecting them all
+    for m in _city_state_re.finditer(header_text):
+        # Don't return if it's clearly from work experience
+        context_start = max(0, m.start() - 50)
+        context_end = min(len(header_text), m.end() + 50)
+        context = header_text[context_start:context_end].lower()
+        if any(word in context for word in ['software', 'developer', 'engineer', 'manager', 'experience', 'lyric', 'startup']):
+            continue
+        # Clean up - remove any trailing job-related text
+        location_str = _location_tail_short_re.sub('', m.group(0).strip())
+        return location_str.strip()
     
     return None
 
-def extract_country(text: str):
+# Common country names (case-insensitive matching)
+_COMMON_COUNTRIES = (
+    "India", "United States", "USA", "US", "United Kingdom", "UK", "Canada",
+    "Australia", "Germany", "France", "Spain", "Italy", "Netherlands",
+    "Brazil", "Mexico", "China", "Japan", "South Korea", "Singapore",
+    "United Arab Emirates", "UAE", "Saudi Arabia", "South Africa"
+)
+# Lowercased word -> first country it names: the full name, or any 4+ char prefix of it
+_COUNTRY_BY_WORD: Dict[str, str] = {}
+for _country in _COMMON_COUNTRIES:
+    _c = _country.lower()
+    _COUNTRY_BY_WORD.setdefault(_c, _country)
+    for _n in range(4, len(_c) + 1):
+        _COUNTRY_BY_WORD.setdefault(_c[:_n], _country)
+# Any country name as a whole word: one scan instead of one search per country.
+# Alternatives that share a start ("USA"/"US", "United ...") can't both match at one position.
+# Matched against the lowercased text (cheaper than IGNORECASE).
+_COUNTRY_ANY_RE = re.compile(r'\b(?:' + '|'.join(re.escape(c.lower()) for c in _COMMON_COUNTRIES) + r')\b')
+
+def extract_country(text: str, lines: Optional[List[str]] = None):
     """Extract country name from resume - prioritize contact info over work experience"""
     if not text:
         return None
     
-    # Common country names (case-insensitive matching)
-    common_countries = [
-        "India", "United States", "USA", "US", "United Kingdom", "UK", "Canada",
-        "Australia", "Germany", "France", "Spain", "Italy", "Netherlands",
-        "Brazil", "Mexico", "China", "Japan", "South Korea", "Singapore",
-        "United Arab Emirates", "UAE", "Saudi Arabia", "South Africa"
-    ]
+    common_countries = _COMMON_COUNTRIES
     
     # Priority 1: Check phone number country code (+91 = India, +1 = US/Canada, etc.)
-    phone_match = re.search(r'\+(\d{1,3})', text)
+    phone_match = _phone_cc_re.search(text)
     if phone_match:
         country_code = phone_match.group(1)
         country_code_map = {
@@ -259,27 +292,28 @@ def extract_country(text: str):
             return country_code_map[country_code]
     
     # Priority 2: Look in header/contact section (first 10 lines) - avoid work experience
-    header_text = "\n".join(text.split('\n')[:10])
-    lines = header_text.split('\n')
-    for line in lines:
+    if lines is None:
+        lines = text.split('\n')
+    header_lines = lines[:10]
+    header_text = "\n".join(header_lines)
+    for line in header_lines:
         line = line.strip()
         # Skip if it looks like work experience (contains job titles, dates, etc.)
         if any(word in line.lower() for word in ['experience', 'developer', 'engineer', 'manager', '20', '19']):
             continue
         if '@' in line or len(line.split()) > 5:
             continue
-        # Check each word in the line against country names
+        # Check each word in the line against country names (one dict lookup per word)
         words = line.split()
         for word in words:
             # Remove punctuation
-            word_clean = re.sub(r'[^\w]', '', word)
-            for country in common_countries:
-                if word_clean.lower() == country.lower() or (len(word_clean) > 3 and country.lower().startswith(word_clean.lower())):
-                    return country
+            word_clean = _non_word_re.sub('', word)
+            country = _COUNTRY_BY_WORD.get(word_clean.lower())
+            if country:
+                return country
     
     # Priority 3: Look for country in location patterns in header section only
-    location_pattern = r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),\s*([A-Z]{2}|[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'
-    m = re.search(location_pattern, header_text)
+    m = _city_state_country_re.search(header_text)
     if m and m.group(3):
         country_part = m.group(3).strip()
         # Check if it's a known country
@@ -288,52 +322,58 @@ def extract_country(text: str):
                 return country
     
     # Priority 4: Fallback - look for "India" specifically (most common)
-    if re.search(r'\bIndia\b', text, re.IGNORECASE):
+    text_lower = text.lower()
+    if _india_re.search(text_lower):
         return "India"
     
-    # Priority 5: Look for any country name anywhere (last resort)
+    # Priority 5: Look for any country name anywhere (last resort), first in list order
+    found = set(_COUNTRY_ANY_RE.findall(text_lower))
     for country in common_countries:
-        pattern = r'\b' + re.escape(country) + r'\b'
-        if re.search(pattern, text, re.IGNORECASE):
+        if country.lower() in found:
             return country
     
     return None
 
+# Months in calendar order; parse_date_to_months takes the first one contained in the string
+_MONTH_NAMES = (
+    ("jan", 1), ("january", 1), ("feb", 2), ("february", 2),
+    ("mar", 3), ("march", 3), ("apr", 4), ("april", 4),
+    ("may", 5), ("jun", 6), ("june", 6),
+    ("jul", 7), ("july", 7), ("aug", 8), ("august", 8),
+    ("sep", 9), ("sept", 9), ("september", 9),
+    ("oct", 10), ("october", 10), ("nov", 11), ("november", 11),
+    ("dec", 12), ("december", 12),
+)
+_year_re = re.compile(r'\b(19|20)\d{2}\b')
+_year_prefix_re = re.compile(r'(19|20)\d{2}')
+_yoe_explicit_re = re.compile(r'(\d{1,2})(?:\s*[-–]\s*(\d{1,2}))?(?:\+)?\s*(?:years|yrs)\s*(?:of\s*)?(?:experience|exp)?\b')
+_date_range_res = (
+    re.compile(r'(\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\w*\s+\d{4})\s*(?:[-–—]|to)\s*(\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\w*\s+\d{4}|present|current)', re.IGNORECASE),
+    re.compile(r'(\b(?:19|20)\d{2})\s*(?:[-–—]|to)\s*(\b(?:19|20)\d{2}|present|current)', re.IGNORECASE),
+    re.compile(r'(\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\w*\s+\d{4})\s*(?:[-–—]|to)\s*(present|current|now)', re.IGNORECASE),
+)
+
 def parse_date_to_months(date_str: str) -> int:
     """Convert date string to months since year 0 (for duration calculation)"""
     if not date_str:
         return 0
     
-    from datetime import datetime
-    CURRENT_YEAR = datetime.now().year
-    CURRENT_MONTH = datetime.now().month
-    
     date_str = date_str.lower().strip()
     
     # Handle "present" or "current"
-    if any(word in date_str for word in ["present", "current", "now", "ongoing"]):
-        return CURRENT_YEAR * 12 + CURRENT_MONTH
+    if any(word in date_str for word in ("present", "current", "now", "ongoing")):
+        now = datetime.now()
+        return now.year * 12 + now.month
     
     # Try to extract year (required)
-    year_match = re.search(r'\b(19|20)\d{2}\b', date_str)
+    year_match = _year_re.search(date_str)
     if not year_match:
         return 0
     
     year = int(year_match.group(0))
     
-    # Try to extract month
-    month_names = {
-        "jan": 1, "january": 1, "feb": 2, "february": 2,
-        "mar": 3, "march": 3, "apr": 4, "april": 4,
-        "may": 5, "jun": 6, "june": 6,
-        "jul": 7, "july": 7, "aug": 8, "august": 8,
-        "sep": 9, "sept": 9, "september": 9,
-        "oct": 10, "october": 10, "nov": 11, "november": 11,
-        "dec": 12, "december": 12
-    }
-    
     month = 1  # Default to January if month not specified
-    for month_name, month_num in month_names.items():
+    for month_name, month_num in _MONTH_NAMES:
         if month_name in date_str:
             month = month_num
             break
@@ -349,7 +389,7 @@ def extract_years_of_experience(text: str):
     txt = (text or "").lower()
     
     # Priority 1: Look for explicit mentions like '5 years', '5+ years', '4 yrs'
-    m = re.search(r'(\d{1,2})(?:\s*[-–]\s*(\d{1,2}))?(?:\+)?\s*(?:years|yrs)\s*(?:of\s*)?(?:experience|exp)?\b', txt)
+    m = _yoe_explicit_re.search(txt)
     if m:
         years_num = int(m.group(1))
         if 0 < years_num <= 50:
@@ -359,15 +399,8 @@ def extract_years_of_experience(text: str):
     date_ranges = []
     
     # Enhanced date range patterns
-    patterns = [
-        r'(\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\w*\s+\d{4})\s*(?:[-–—]|to)\s*(\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\w*\s+\d{4}|present|current)',
-        r'(\b(?:19|20)\d{2})\s*(?:[-–—]|to)\s*(\b(?:19|20)\d{2}|present|current)',
-        r'(\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\w*\s+\d{4})\s*(?:[-–—]|to)\s*(present|current|now)',
-    ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        for start_str, end_str in matches:
+    for pattern in _date_range_res:
+        for start_str, end_str in pattern.findall(text):
             start_months = parse_date_to_months(start_str)
             end_months = parse_date_to_months(end_str)
             
@@ -404,7 +437,7 @@ def extract_years_of_experience(text: str):
             return int(round(total_years))  # Return integer for dropdown matching
     
     # Priority 3: Simple year range estimation (fallback)
-    years = re.findall(r'(19|20)\d{2}', text or "")
+    years = _year_prefix_re.findall(text or "")
     if len(years) >= 2:
         try:
             low = int(min(years))
@@ -426,11 +459,22 @@ def extract_years_of_experience(text: str):
 # -------------------------
 # Matching helpers
 # -------------------------
+# ASCII non-word characters -> space, so str.split() yields the same tokens as \w+
+_NON_WORD_TRANS = str.maketrans({chr(c): " " for c in range(128) if not (chr(c).isalnum() or chr(c) == "_")})
+_word_re = re.compile(r'\w+')
+
+def word_tokens(s: str) -> set:
+    """Lowercased word tokens (same as re '\\w+'); str.translate + split fast path for ASCII text."""
+    s = s.lower()
+    if s.isascii():
+        return set(s.translate(_NON_WORD_TRANS).split())
+    return set(_word_re.findall(s))
+
 def simple_token_overlap(a: str, b: str) -> float:
     if not a or not b:
         return 0.0
-    atoks = set(re.findall(r'\w+', a.lower()))
-    btoks = set(re.findall(r'\w+', b.lower()))
+    atoks = word_tokens(a)
+    btoks = word_tokens(b)
     if not atoks or not btoks:
         return 0.0
     inter = atoks.intersection(btoks)
@@ -495,200 +539,346 @@ def is_behavioral_question(label: str) -> bool:
     ]
     return any(x in lbl for x in behavioral_patterns)
 
+# Filler words ignored when matching yes/no question keywords against the resume
+_YN_STOPWORDS = frozenset({'you', 'do', 'have', 'are', 'the', 'a', 'an', 'is', 'and', 'or', 'of', 'to'})
+
 def detect_technology_from_label(label: str):
     lbl = (label or "").lower()
     for tech in ["react", "python", "java", "c++", "c#", "node", "javascript", "typescript", "aws", "azure", "docker", "kubernetes"]:
         if tech in lbl:
             return tech
     return None
-
 # -------------------------
 # Main generator
 # -------------------------
-async def generate_gist_for_labels(parsed_resume: Dict[str, Any], jd_data: Dict[str, Any], labels: List[str]) -> Dict[str, str]:
+_SALARY_FALLBACK = "I'm open to discussing compensation that aligns with market standards and reflects my experience and the value I bring to the role."
+_COVER_FALLBACK = "I'm excited about this opportunity and confident my experience aligns with the role."
+_BEHAVIORAL_FALLBACK = "Based on my experience, I have led cross-functional initiatives that delivered measurable results."
+_BEHAVIORAL_FALLBACK_LONG = _BEHAVIORAL_FALLBACK + " I focus on clear communication, stakeholder alignment, and iterative delivery to ensure success."
+
+def _fallback_answer(lbl: str, qtype: str, behavioral: str = _BEHAVIORAL_FALLBACK) -> str:
+    """Canned answer used when the LLM did not answer a question."""
+    if qtype == "behavioral":
+        return behavioral
+    if qtype == "salary":
+        return _SALARY_FALLBACK
+    if _lbl_cover_re.search(lbl.lower()):
+        return _COVER_FALLBACK
+    return ""
+
+# LLM answer cache: the same questions recur across near-identical applications.
+# Keyed on (label, trimmed-resume digest, trimmed-JD digest); in-process LRU.
+_LLM_CACHE_SIZE = int(os.getenv("GIST_LLM_CACHE_SIZE", "2048"))
+_llm_answer_cache: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+
+def _text_digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8", "ignore"), digest_size=16).hexdigest()
+
+def _cache_get(key: Tuple[str, str, str]):
+    answer = _llm_answer_cache.get(key)
+    if answer is not None:
+        _llm_answer_cache.move_to_end(key)
+    return answer
+
+def _cache_put(key: Tuple[str, str, str], answer: str):
+    if _LLM_CACHE_SIZE <= 0:
+        return
+    _llm_answer_cache[key] = answer
+    _llm_answer_cache.move_to_end(key)
+    while len(_llm_answer_cache) > _LLM_CACHE_SIZE:
+        _llm_answer_cache.popitem(last=False)
+
+def _answer_key_index(batch_answers: Dict[str, Any]) -> Tuple[Dict[str, str], List[Tuple[str, str]]]:
+    """Lowercase the LLM answer keys once per response: (first key per lowered key, [(key, lowered)])."""
+    keys_lower = [(k, k.lower()) for k in batch_answers]
+    by_lower: Dict[str, str] = {}
+    for k, k_low in keys_lower:
+        by_lower.setdefault(k_low, k)
+    return by_lower, keys_lower
+
+def _match_batch_answer(lbl: str, batch_answers: Dict[str, Any], key_index=None):
+    """Find the LLM answer for a label (handles slight variations in question text)."""
+    # Try exact match first
+    if lbl in batch_answers:
+        return batch_answers[lbl]
+    by_lower, keys_lower = key_index or _answer_key_index(batch_answers)
+    lbl_low = lbl.lower()
+    # Try case-insensitive match
+    k = by_lower.get(lbl_low)
+    answer = batch_answers[k] if k is not None else None
+    if not answer:
+        # Try partial match (question might be slightly different)
+        lbl_len = len(lbl)
+        answer = next((batch_answers[k] for k, k_low in keys_lower
+                       if lbl_low in k_low or k_low in lbl_low or
+                       abs(len(k) - lbl_len) <= 5), None)
+    return answer
+
+# Forms with at least this many labels classify them on worker threads
+_PARALLEL_LABEL_THRESHOLD = int(os.getenv("GIST_PARALLEL_LABELS", "50"))
+
+# Resume-side extraction cache: the same resume is re-sent for every form/page of an application.
+# Keyed on the resume text digest; in-process LRU.
+_RESUME_CTX_CACHE_SIZE = int(os.getenv("GIST_RESUME_CACHE_SIZE", "64"))
+_resume_ctx_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+def _extract_resume_fields(resume_text: str) -> Dict[str, Any]:
+    """Everything the classification reads from the resume alone (cached per resume text)."""
+    key = _text_digest(resume_text)
+    fields = _resume_ctx_cache.get(key)
+    if fields is not None:
+        _resume_ctx_cache.move_to_end(key)
+        return fields
+    # ⚡ Split once; location and country both scan the top lines
+    raw_lines = resume_text.split('\n')
+    links = extract_links(resume_text)
+    linkedin = None
+    github = None
+    for l in links:
+        l_low = l.lower()
+        if "linkedin.com" in l_low:
+            linkedin = l
+        if "github.com" in l_low:
+            github = l
+    fields = {
+        "resume_text": resume_text,
+        "resume_lower": resume_text.lower(),
+        "email": extract_email(resume_text),
+        "phone": extract_phone(resume_text),
+        "name": extract_name_from_text(resume_text),
+        "location": extract_location(resume_text, raw_lines),
+        "country": extract_country(resume_text, raw_lines),
+        "yoe": extract_years_of_experience(resume_text),
+        "linkedin": linkedin,
+        "github": github,
+        # take top N snippets from resume (split into sentences)
+        # (maxsplit leaves the tail unsplit instead of allocating every later piece)
+        "resume_snippets": _snippet_split_re.split(resume_text, 200)[:200],
+    }
+    if _RESUME_CTX_CACHE_SIZE > 0:
+        _resume_ctx_cache[key] = fields
+        while len(_resume_ctx_cache) > _RESUME_CTX_CACHE_SIZE:
+            _resume_ctx_cache.popitem(last=False)
+    return fields
+
+def _build_context(resume_text: str, jd_text: str) -> Dict[str, Any]:
+    """Pre-extract everything the per-label classification reads (shared, read-only)."""
+    ctx = dict(_extract_resume_fields(resume_text))
+    ctx["jd_snippets"] = _snippet_split_re.split(jd_text or "", 200)[:200]
+    return ctx
+
+# Label patterns for _classify_one / _fallback_answer, matched against the lowercased label
+# (case-sensitive search on a pre-lowered string beats re.I per pattern)
+_lbl_full_name_re = re.compile(r'first\s*name|full\s*name')
+_lbl_name_re = re.compile(r'name')
+_lbl_email_re = re.compile(r'email')
+_lbl_phone_re = re.compile(r'phone|mobile|contact')
+_lbl_linkedin_re = re.compile(r'linkedin')
+_lbl_github_re = re.compile(r'github|portfolio|website')
+_lbl_yoe_re = re.compile(r'years.*experience|total.*years|yoe|years of experience')
+_lbl_location_re = re.compile(r'location|city|current location|current city|address')
+_lbl_country_re = re.compile(r'country|nationality|citizenship')
+_lbl_salary_re = re.compile(r'salary|compensation|pay|expectation.*role|expected.*salary|salary.*expectation')
+_lbl_notice_re = re.compile(r'notice period')
+_lbl_relocation_re = re.compile(r'relocation')
+_lbl_cover_re = re.compile(r'cover|why do you want')
+_digits_re = re.compile(r'(\d+)')
+
+# Profile-field labels in priority order (first match wins)
+_LABEL_FIELD_RES = (
+    ("email", _lbl_email_re),
+    ("phone", _lbl_phone_re),
+    ("linkedin", _lbl_linkedin_re),
+    ("github", _lbl_github_re),
+    ("yoe", _lbl_yoe_re),
+    ("location", _lbl_location_re),
+    ("country", _lbl_country_re),
+    ("salary", _lbl_salary_re),
+    ("notice", _lbl_notice_re),
+    ("relocation", _lbl_relocation_re),
+)
+
+@functools.lru_cache(maxsize=4096)
+def _label_field(lbl_norm: str) -> Optional[str]:
+    """Which profile field a (stripped) label asks for, if any.
+    Cached: the same labels ("First Name", "Email", ...) recur on every form."""
+    lbl_low = lbl_norm.lower()
+    if _lbl_full_name_re.search(lbl_low) or _lbl_name_re.search(lbl_low) and len(lbl_norm) < 40:
+        return "name"
+    for field, pattern in _LABEL_FIELD_RES:
+        if pattern.search(lbl_low):
+            return field
+    return None
+
+def _classify_one(lbl: str, ctx: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
     """
-    Generates mapping label -> short answer.
-    parsed_resume: {"raw_text": "...", ...}
-    jd_data: {"job_description": "..."}
-    labels: list[str]
+    Deterministically answer a single label.
+    Returns (answer, None) when answered, (None, question_type) when the LLM is needed,
+    and (None, None) for blank labels.
     """
-    try:
-        resume_text = parsed_resume.get("raw_text", "") if isinstance(parsed_resume, dict) else str(parsed_resume or "")
-        jd_text = jd_data.get("job_description", "") if isinstance(jd_data, dict) else str(jd_data or "")
-
-        # Pre-extract some fields
-        email = extract_email(resume_text)
-        phone = extract_phone(resume_text)
-        links = extract_links(resume_text)
-        name = extract_name_from_text(resume_text)
-        location = extract_location(resume_text)
-        country = extract_country(resume_text)
-        yoe = extract_years_of_experience(resume_text)
-        linkedin = None
-        github = None
-        for l in links:
-            if "linkedin.com" in l.lower():
-                linkedin = l
-            if "github.com" in l.lower():
-                github = l
-
-        answers = {}
-        # Collect questions that need LLM (after simple extraction)
-        llm_questions = []  # List of (label, question_type) tuples
-
-        # First pass: Handle all simple/extractable questions
-        for lbl in labels:
-            lbl_norm = (lbl or "").strip()
-            if not lbl_norm:
-                continue
+    lbl_norm = (lbl or "").strip()
+    if not lbl_norm:
+        return None, None
+    field = _label_field(lbl_norm)
 
-            # Exact/common label matches
-            if re.search(r'first\s*name', lbl_norm, re.I) or re.search(r'full\s*name', lbl_norm, re.I) or re.search(r'name', lbl_norm, re.I) and len(lbl_norm) < 40:
-                answers[lbl] = name or ""
-                continue
-            if re.search(r'email', lbl_norm, re.I):
-                answers[lbl] = email or ""
-                continue
-            if re.search(r'phone|mobile|contact', lbl_norm, re.I):
-                answers[lbl] = phone or ""
-                continue
-            if re.search(r'linkedin', lbl_norm, re.I):
-                answers[lbl] = linkedin or email or ""
-                continue
-            if re.search(r'github|portfolio|website', lbl_norm, re.I):
-                answers[lbl] = github or ""
-                continue
-            if re.search(r'years.*experience|total.*years|yoe|years of experience', lbl_norm, re.I):
-                # Return numeric value for dropdown matching (autofill.js will handle range matching)
-                if yoe and isinstance(yoe, (int, float)) and yoe > 0:
-                    # Return as string (numeric) for both text fields and dropdowns
-                    # autofill.js will parse it and match against dropdown ranges
-                    answers[lbl] = str(int(yoe))
-                elif yoe:
-                    # If yoe is a string or other format, try to extract number
-                    yoe_str = str(yoe)
-                    yoe_num_match = re.search(r'(\d+)', yoe_str)
-                    if yoe_num_match:
-                        answers[lbl] = yoe_num_match.group(1)
-                    else:
-                        answers[lbl] = ""
-                else:
-                    answers[lbl] = ""
-                continue
-            
-            # Location fields
-            if re.search(r'location|city|current location|current city|address', lbl_norm, re.I):
-                answers[lbl] = location or ""
-                continue
-            
-            # Country fields (separate from location)
-            if re.search(r'country|nationality|citizenship', lbl_norm, re.I):
-                answers[lbl] = country or ""
-                continue
+    # Exact/common label matches
+    if field == "name":
+        return ctx["name"] or "", None
+    if field == "email":
+        return ctx["email"] or "", None
+    if field == "phone":
+        return ctx["phone"] or "", None
+    if field == "linkedin":
+        return ctx["linkedin"] or ctx["email"] or "", None
+    if field == "github":
+        return ctx["github"] or "", None
+    if field == "yoe":
+        yoe = ctx["yoe"]
+        # Return numeric value for dropdown matching (autofill.js will handle range matching)
+        if yoe and isinstance(yoe, (int, float)) and yoe > 0:
+            # Return as string (numeric) for both text fields and dropdowns
+            # autofill.js will parse it and match against dropdown ranges
+            return str(int(yoe)), None
+        if yoe:
+            # If yoe is a string or other format, try to extract number
+            yoe_num_match = _digits_re.search(str(yoe))
+            return (yoe_num_match.group(1) if yoe_num_match else ""), None
+        return "", None
 
-            # Salary / compensation expectations - collect for batch LLM (better answers)
-            if re.search(r'salary|compensation|pay|expectation.*role|expected.*salary|salary.*expectation', lbl_norm, re.I):
-                if _LLM_AVAILABLE:
-                    llm_questions.append((lbl, "salary"))  # Special handling for salary
-                else:
-                    # Fallback professional answer if LLM not available
-                    answers[lbl] = "I'm open to discussing compensation that aligns with market standards and reflects my experience and the value I bring to the role."
-                continue
-            
-            # Notice period / relocation
-            if re.search(r'notice period', lbl_norm, re.I):
-                answers[lbl] = "30 days"
-                continue
-            if re.search(r'relocation', lbl_norm, re.I):
-                answers[lbl] = "Yes"
-                continue
+    # Location fields
+    if field == "location":
+        return ctx["location"] or "", None
 
-            # Yes/No questions - keep simple (check AFTER salary to avoid conflicts)
-            if is_yes_no_question(lbl_norm):
-                tech = detect_technology_from_label(lbl_norm)
-                if tech:
-                    answers[lbl] = "Yes" if tech in resume_text.lower() else "No"
-                    continue
-                # For general yes/no questions, check if resume has relevant experience
-                # Look for keywords in the question and check if they appear in resume
-                question_keywords = set(re.findall(r'\w+', lbl_norm.lower()))
-                question_keywords.discard('you')
-                question_keywords.discard('do')
-                question_keywords.discard('have')
-                question_keywords.discard('are')
-                resume_lower = resume_text.lower()
-                # If any significant keywords from question appear in resume, answer Yes
-                if any(len(kw) > 3 and kw in resume_lower for kw in question_keywords):
-                    answers[lbl] = "Yes"
-                else:
-                    answers[lbl] = "No"
-                continue
+    # Country fields (separate from location)
+    if field == "country":
+        return ctx["country"] or "", None
 
-            # For behavioral questions, skip token overlap and go straight to LLM for proper STAR answers
-            # For other questions, try to match from resume by token overlap with label
-            if not is_behavioral_question(lbl_norm):
-                best_score = 0.0
-                best_snippet = ""
-                # take top N snippets from resume (split into sentences)
-                snippets = re.split(r'[\n\r]+|\.\s+', resume_text)[:200]
-                for s in snippets:
-                    score = simple_token_overlap(lbl_norm, s)
-                    if score > best_score:
-                        best_score = score
-                        best_snippet = s
-                if best_score >= 0.25:
-                    # trim snippet to 200 chars
-                    answers[lbl] = (best_snippet.strip()[:200])
-                    continue
-
-                # As a last deterministic fallback, try check JD for label-specific hints
-                best_score_jd = 0.0
-                best_snippet_jd = ""
-                jd_snips = re.split(r'[\n\r]+|\.\s+', jd_text or "")[:200]
-                for s in jd_snips:
-                    sc = simple_token_overlap(lbl_norm, s)
-                    if sc > best_score_jd:
-                        best_score_jd = sc
-                        best_snippet_jd = s
-                if best_score_jd >= 0.25:
-                    answers[lbl] = best_snippet_jd.strip()[:200]
-                    continue
-
-            # If still nothing, collect for batch LLM processing (don't call individually)
-            if _LLM_AVAILABLE:
-                # Determine question type for batch processing
-                if is_behavioral_question(lbl_norm):
-                    llm_questions.append((lbl, "behavioral"))
-                elif is_long_form_question(lbl_norm):
-                    llm_questions.append((lbl, "long_form"))
-                else:
-                    llm_questions.append((lbl, "short"))
-            else:
-                # Final absolute fallback (short generic text) if LLM not available
-                if re.search(r'cover|why do you want', lbl_norm, re.I):
-                    answers[lbl] = "I'm excited about this opportunity and confident my experience aligns with the role."
-                else:
-                    answers[lbl] = ""
+    # Salary / compensation expectations - collect for batch LLM (better answers)
+    if field == "salary":
+        if _LLM_AVAILABLE:
+            return None, "salary"  # Special handling for salary
+        # Fallback professional answer if LLM not available
+        return _SALARY_FALLBACK, None
 
-        # ============================================
-        # BATCH LLM PROCESSING: ONE call for all remaining questions
-        # ============================================
-        if _LLM_AVAILABLE and llm_questions:
-            try:
-                logger.info(f"📤 Batch LLM call for {len(llm_questions)} questions")
-                
-                # Group questions by type for better prompt organization
-                behavioral_questions = [lbl for lbl, qtype in llm_questions if qtype == "behavioral"]
-                salary_questions = [lbl for lbl, qtype in llm_questions if qtype == "salary"]
-                long_form_questions = [lbl for lbl, qtype in llm_questions if qtype == "long_form"]
-                short_questions = [lbl for lbl, qtype in llm_questions if qtype == "short"]
-                
-                # Trim inputs to avoid token limits
-                trimmed_resume = trim_text(resume_text, 3000)
-                trimmed_jd = trim_text(jd_text, 2000)
-                
-                # Build comprehensive batch prompt (similar to previous working version)
-                batch_prompt = f"""You are filling out a job application form on behalf of the candidate.
+    # Notice period / relocation
+    if field == "notice":
+        return "30 days", None
+    if field == "relocation":
+        return "Yes", None
+
+    # Yes/No questions - keep simple (check AFTER salary to avoid conflicts)
+    if is_yes_no_question(lbl_norm):
+        resume_lower = ctx["resume_lower"]
+        tech = detect_technology_from_label(lbl_norm)
+        if tech:
+            return ("Yes" if tech in resume_lower else "No"), None
+        # For general yes/no questions, check if resume has relevant experience
+        # Look for keywords in the question and check if they appear in resume
+        question_keywords = word_tokens(lbl_norm) - _YN_STOPWORDS
+        # If any significant keywords from question appear in resume, answer Yes
+        if any(len(kw) > 3 and kw in resume_lower for kw in question_keywords):
+            return "Yes", None
+        return "No", None
+
+    # For behavioral questions, skip token overlap and go straight to LLM for proper STAR answers
+    # For other questions, try to match from resume by token overlap with label
+    behavioral = is_behavioral_question(lbl_norm)
+    if not behavioral:
+        best_score = 0.0
+        best_snippet = ""
+        for s in ctx["resume_snippets"]:
+            score = simple_token_overlap(lbl_norm, s)
+            if score > best_score:
+                best_score = score
+                best_snippet = s
+        if best_score >= 0.25:
+            # trim snippet to 200 chars
+            return best_snippet.strip()[:200], None
+
+        # As a last deterministic fallback, try check JD for label-specific hints
+        best_score_jd = 0.0
+        best_snippet_jd = ""
+        for s in ctx["jd_snippets"]:
+            sc = simple_token_overlap(lbl_norm, s)
+            if sc > best_score_jd:
+                best_score_jd = sc
+                best_snippet_jd = s
+        if best_score_jd >= 0.25:
+            return best_snippet_jd.strip()[:200], None
+
+    # If still nothing, collect for batch LLM processing (don't call individually)
+    if _LLM_AVAILABLE:
+        # Determine question type for batch processing
+        if behavioral:
+            return None, "behavioral"
+        if is_long_form_question(lbl_norm):
+            return None, "long_form"
+        return None, "short"
+    # Final absolute fallback (short generic text) if LLM not available
+    if _lbl_cover_re.search(lbl_norm.lower()):
+        return _COVER_FALLBACK, None
+    return "", None
+
+async def _first_pass(resume_text: str, jd_text: str, labels: List[str]) -> Tuple[Dict[str, str], List[Tuple[str, str]]]:
+    """
+    Deterministic pass: answers every label that can be extracted from resume/JD.
+    Returns (answers, llm_questions) where llm_questions is a list of (label, question_type)
+    still needing the LLM.
+    """
+    ctx = _build_context(resume_text, jd_text)
+    unique_labels = list(dict.fromkeys(labels))
+
+    # Labels are independent, so large forms are classified on worker threads
+    if len(unique_labels) >= _PARALLEL_LABEL_THRESHOLD:
+        outcomes = await asyncio.gather(*(asyncio.to_thread(_classify_one, lbl, ctx) for lbl in unique_labels))
+    else:
+        outcomes = [_classify_one(lbl, ctx) for lbl in unique_labels]
+
+    answers = {}
+    # Collect questions that need LLM (after simple extraction)
+    llm_questions = []  # List of (label, question_type) tuples
+    for lbl, (answer, qtype) in zip(unique_labels, outcomes):
+        if qtype:
+            llm_questions.append((lbl, qtype))
+        elif answer is not None:
+            answers[lbl] = answer
+    return answers, llm_questions
+
+def _append_question_groups(parts: List[str], llm_questions: List[Tuple[str, str]]) -> None:
+    """Append the LLM questions to the prompt parts, grouped by question type."""
+    # Group questions by type for better prompt organization
+    behavioral_questions = [lbl for lbl, qtype in llm_questions if qtype == "behavioral"]
+    salary_questions = [lbl for lbl, qtype in llm_questions if qtype == "salary"]
+    long_form_questions = [lbl for lbl, qtype in llm_questions if qtype == "long_form"]
+    short_questions = [lbl for lbl, qtype in llm_questions if qtype == "short"]
+
+    # Add behavioral questions with STAR instructions
+    if behavioral_questions:
+        parts.append("\n\n=== BEHAVIORAL QUESTIONS (use STAR method - Situation, Task, Action, Result, 3-5 sentences each) ===")
+        parts.extend(f"\n{i}. {q}" for i, q in enumerate(behavioral_questions, 1))
+
+    # Add salary questions
+    if salary_questions:
+        parts.append("\n\n=== SALARY QUESTIONS (diplomatic, 1-2 sentences, open to negotiation) ===")
+        parts.extend(f"\n{i}. {q}" for i, q in enumerate(salary_questions, 1))
+
+    # Add long-form questions
+    if long_form_questions:
+        parts.append("\n\n=== LONG-FORM QUESTIONS (2-4 sentences each, thoughtful and professional) ===")
+        parts.extend(f"\n{i}. {q}" for i, q in enumerate(long_form_questions, 1))
+
+    # Add short questions
+    if short_questions:
+        parts.append("\n\n=== SHORT QUESTIONS (1-2 sentences each, concise) ===")
+        parts.extend(f"\n{i}. {q}" for i, q in enumerate(short_questions, 1))
+
+def _build_single_prompt(resume_text: str, jd_text: str, llm_questions: List[Tuple[str, str]]) -> str:
+    # Trim inputs to avoid token limits
+    trimmed_resume = trim_text(resume_text, 3000)
+    trimmed_jd = trim_text(jd_text, 2000)
+
+    # Build comprehensive batch prompt (similar to previous working version)
+    parts = [f"""You are filling out a job application form on behalf of the candidate.
 
 Answer these questions as if you ARE the candidate (first person).
 Keep answers SHORT and professional (1-2 sentences for short questions, 2-4 for long-form, 3-5 for behavioral).
@@ -701,119 +891,160 @@ Job Description (for context):
 
 IMPORTANT: Answer ALL questions below. Return your answers in JSON format where the key is the EXACT question text (as shown) and value is the answer string.
 
-QUESTIONS TO ANSWER:"""
-                
-                # Add behavioral questions with STAR instructions
-                if behavioral_questions:
-                    batch_prompt += "\n\n=== BEHAVIORAL QUESTIONS (use STAR method - Situation, Task, Action, Result, 3-5 sentences each) ==="
-                    for i, q in enumerate(behavioral_questions, 1):
-                        batch_prompt += f"\n{i}. {q}"
-                
-                # Add salary questions
-                if salary_questions:
-                    batch_prompt += "\n\n=== SALARY QUESTIONS (diplomatic, 1-2 sentences, open to negotiation) ==="
-                    for i, q in enumerate(salary_questions, 1):
-                        batch_prompt += f"\n{i}. {q}"
-                
-                # Add long-form questions
-                if long_form_questions:
-                    batch_prompt += "\n\n=== LONG-FORM QUESTIONS (2-4 sentences each, thoughtful and professional) ==="
-                    for i, q in enumerate(long_form_questions, 1):
-                        batch_prompt += f"\n{i}. {q}"
-                
-                # Add short questions
-                if short_questions:
-                    batch_prompt += "\n\n=== SHORT QUESTIONS (1-2 sentences each, concise) ==="
-                    for i, q in enumerate(short_questions, 1):
-                        batch_prompt += f"\n{i}. {q}"
-                
-                batch_prompt += f"""
+QUESTIONS TO ANSWER:"""]
+
+    _append_question_groups(parts, llm_questions)
+
+    parts.append("""
 
-Return ONLY valid JSON: {{"question": "answer", ...}}
+Return ONLY valid JSON: {"question": "answer", ...}
 Use the EXACT question text as shown above as the JSON key.
 
-Example format:
-{json.dumps({q: "Sample answer" for q in (behavioral_questions[:1] + salary_questions[:1] + long_form_questions[:1] + short_questions[:1]) if q}, indent=2)}
-"""
+Example: {"<exact question>": "<answer>", ...}
+""")
+    return "".join(parts)
 
-                llm_response = await call_gpt_model(batch_prompt)
-                
-                # Use safe parsing (handles non-JSON responses gracefully)
-                batch_answers = safe_parse_gist_output(llm_response)
-                
-                # Map answers back to labels (handle slight variations in question text)
-                if batch_answers:
-                    for lbl, qtype in llm_questions:
-                        answer = None
-                        # Try exact match first
-                        if lbl in batch_answers:
-                            answer = batch_answers[lbl]
-                        else:
-                            # Try case-insensitive match
-                            answer = next((batch_answers[k] for k in batch_answers.keys() if k.lower() == lbl.lower()), None)
-                            if not answer:
-                                # Try partial match (question might be slightly different)
-                                answer = next((batch_answers[k] for k in batch_answers.keys() 
-                                             if lbl.lower() in k.lower() or k.lower() in lbl.lower() or 
-                                             abs(len(k) - len(lbl)) <= 5), None)
-                        
-                        if answer:
-                            max_chars = 500 if qtype in ["behavioral", "long_form"] else 200
-                            answers[lbl] = str(answer).strip()[:max_chars]
-                        else:
-                            # Fallback if question not found in response
-                            if qtype == "behavioral":
-                                answers[lbl] = "Based on my experience, I have led cross-functional initiatives that delivered measurable results. I focus on clear communication, stakeholder alignment, and iterative delivery to ensure success."
-                            elif qtype == "salary":
-                                answers[lbl] = "I'm open to discussing compensation that aligns with market standards and reflects my experience and the value I bring to the role."
-                            elif re.search(r'cover|why do you want', lbl.lower()):
-                                answers[lbl] = "I'm excited about this opportunity and confident my experience aligns with the role."
-                            else:
-                                answers[lbl] = ""
-                    
-                    logger.info(f"✅ Batch LLM processed {len([a for a in answers.values() if a])} answers successfully")
-                else:
-                    logger.warning("⚠️ No answers extracted from LLM response")
-                    # Fallback for all questions if parsing returned empty
-                    for lbl, qtype in llm_questions:
-                        if qtype == "behavioral":
-                            answers[lbl] = "Based on my experience, I have led cross-functional initiatives that delivered measurable results."
-                        elif qtype == "salary":
-                            answers[lbl] = "I'm open to discussing compensation that aligns with market standards and reflects my experience and the value I bring to the role."
-                        elif re.search(r'cover|why do you want', lbl.lower()):
-                            answers[lbl] = "I'm excited about this opportunity and confident my experience aligns with the role."
-                        else:
-                            answers[lbl] = ""
-            except Exception as parse_error:
-                logger.warning(f"Failed to process LLM response: {parse_error}")
-                logger.debug(f"Response was: {llm_response[:1000] if 'llm_response' in locals() else 'N/A'}")
-                # Fallback for all questions if exception occurred
+def _build_multi_prompt(pending: List[Tuple[int, str, str, List[Tuple[str, str]]]]) -> str:
+    """Prompt covering several applications; the reply is keyed by application ID, then question."""
+    parts = ["""You are filling out several job application forms, each on behalf of its candidate.
+
+Answer these questions as if you ARE the candidate of that application (first person).
+Keep answers SHORT and professional (1-2 sentences for short questions, 2-4 for long-form, 3-5 for behavioral).
+
+IMPORTANT: Answer ALL questions of ALL applications below."""]
+
+    for item_idx, resume_text, jd_text, llm_questions in pending:
+        parts.append(f"""
+
+##### APPLICATION {item_idx} #####
+
+Resume Summary:
+{trim_text(resume_text, 3000)}
+
+Job Description (for context):
+{trim_text(jd_text, 2000)}
+
+QUESTIONS TO ANSWER:""")
+        _append_question_groups(parts, llm_questions)
+
+    parts.append("""
+
+Return ONLY valid JSON keyed by application ID, then by question: {"<application id>": {"question": "answer", ...}, ...}
+Use the EXACT question text as shown above as the inner JSON key.
+""")
+    return "".join(parts)
+
+# Applications per multi-item LLM prompt (each adds ~5k chars of context; gemma-2-9b-it has an 8k window)
+_BATCH_MAX_ITEMS = max(1, int(os.getenv("GIST_BATCH_MAX_ITEMS", "3")))
+# Upper bound on the completion length requested for one batch prompt
+_BATCH_MAX_TOKENS = 1200
+
+async def _answer_pending(pending: List[Tuple[int, str, str, List[Tuple[str, str]]]],
+                          results: List[Dict[str, str]], item_digests: Dict[int, Tuple[str, str]]) -> None:
+    """ONE LLM call answering the remaining questions of the given items; fills results in place."""
+    try:
+        logger.info(f"📤 Batch LLM call for {sum(len(p[3]) for p in pending)} questions across {len(pending)} application(s)")
+
+        if len(pending) == 1:
+            _, resume_text, jd_text, llm_questions = pending[0]
+            batch_prompt = _build_single_prompt(resume_text, jd_text, llm_questions)
+        else:
+            batch_prompt = _build_multi_prompt(pending)
+
+        llm_response = await call_gpt_model(batch_prompt, max_tokens=min(400 * len(pending), _BATCH_MAX_TOKENS))
+
+        # Use safe parsing (handles non-JSON responses gracefully)
+        batch_answers = safe_parse_gist_output(llm_response)
+
+        for item_idx, _, _, llm_questions in pending:
+            answers = results[item_idx]
+            if len(pending) == 1:
+                item_answers = batch_answers
+            else:
+                item_answers = batch_answers.get(str(item_idx)) if isinstance(batch_answers, dict) else None
+                if not isinstance(item_answers, dict):
+                    item_answers = {}
+
+            # Map answers back to labels (handle slight variations in question text)
+            if item_answers:
+                key_index = _answer_key_index(item_answers)
                 for lbl, qtype in llm_questions:
-                    if qtype == "behavioral":
-                        answers[lbl] = "Based on my experience, I have led cross-functional initiatives that delivered measurable results."
-                    elif qtype == "salary":
-                        answers[lbl] = "I'm open to discussing compensation that aligns with market standards and reflects my experience and the value I bring to the role."
-                    elif re.search(r'cover|why do you want', lbl.lower()):
-                        answers[lbl] = "I'm excited about this opportunity and confident my experience aligns with the role."
+                    answer = _match_batch_answer(lbl, item_answers, key_index)
+                    if answer:
+                        max_chars = 500 if qtype in ["behavioral", "long_form"] else 200
+                        answers[lbl] = str(answer).strip()[:max_chars]
+                        _cache_put((lbl, *item_digests[item_idx]), answers[lbl])
                     else:
-                        answers[lbl] = ""
-            except Exception as e:
-                logger.error(f"Batch LLM processing failed: {e}")
-                # Fallback for all LLM questions
+                        # Fallback if question not found in response
+                        answers[lbl] = _fallback_answer(lbl, qtype, _BEHAVIORAL_FALLBACK_LONG)
+
+                logger.info(f"✅ Batch LLM processed {len([a for a in answers.values() if a])} answers successfully")
+            else:
+                logger.warning("⚠️ No answers extracted from LLM response")
+                # Fallback for all questions if parsing returned empty
                 for lbl, qtype in llm_questions:
-                    if qtype == "behavioral":
-                        answers[lbl] = "Based on my experience, I have led cross-functional initiatives that delivered measurable results."
-                    elif qtype == "salary":
-                        answers[lbl] = "I'm open to discussing compensation that aligns with market standards and reflects my experience and the value I bring to the role."
-                    elif re.search(r'cover|why do you want', lbl.lower()):
-                        answers[lbl] = "I'm excited about this opportunity and confident my experience aligns with the role."
-                    else:
-                        answers[lbl] = ""
+                    answers[lbl] = _fallback_answer(lbl, qtype)
+    except Exception as e:
+        logger.error(f"Batch LLM processing failed: {e}")
+        logger.debug(f"Response was: {llm_response[:1000] if 'llm_response' in locals() else 'N/A'}")
+        # Fallback for all LLM questions
+        for item_idx, _, _, llm_questions in pending:
+            for lbl, qtype in llm_questions:
+                results[item_idx][lbl] = _fallback_answer(lbl, qtype)
 
-        return answers
+async def generate_gist_batch(items: List[Tuple[Dict[str, Any], Dict[str, Any], List[str]]]) -> List[Dict[str, str]]:
+    """
+    Generates label -> short answer mappings for several applications at once.
+    items: list of (parsed_resume, jd_data, labels) triples, same shapes as generate_gist_for_labels.
+    The deterministic pass runs per item; remaining questions go to one LLM call per GIST_BATCH_MAX_ITEMS items.
+    Returns one answers dict per item, in input order.
+    """
+    results: List[Dict[str, str]] = []
+    # (item_idx, resume_text, jd_text, llm_questions) for items that still need the LLM
+    pending = []
+    item_digests: Dict[int, Tuple[str, str]] = {}
 
-    except Exception as e:
-        logger.error(f"generate_gist_for_labels error: {e}")
-        return {lbl: "" for lbl in labels}
+    for item_idx, (parsed_resume, jd_data, labels) in enumerate(items):
+        try:
+            resume_text = parsed_resume.get("raw_text", "") if isinstance(parsed_resume, dict) else str(parsed_resume or "")
+            jd_text = jd_data.get("job_description", "") if isinstance(jd_data, dict) else str(jd_data or "")
+            answers, llm_questions = await _first_pass(resume_text, jd_text, labels)
+        except Exception as e:
+            logger.error(f"generate_gist_batch error (item {item_idx}): {e}")
+            answers, llm_questions = {lbl: "" for lbl in labels}, []
+        results.append(answers)
+        if _LLM_AVAILABLE and llm_questions:
+            # Serve previously answered questions from cache (digests computed once per item)
+            digests = (_text_digest(trim_text(resume_text, 3000)), _text_digest(trim_text(jd_text, 2000)))
+            uncached = []
+            for lbl, qtype in llm_questions:
+                cached = _cache_get((lbl, *digests))
+                if cached is not None:
+                    answers[lbl] = cached
+                else:
+                    uncached.append((lbl, qtype))
+            item_digests[item_idx] = digests
+            if uncached:
+                pending.append((item_idx, resume_text, jd_text, uncached))
 
+    if not pending:
+        return results
 
+    # ============================================
+    # BATCH LLM PROCESSING: one call per sub-batch of items, sub-batches run concurrently
+    # ============================================
+    # ⚡ Every item adds ~5k chars of resume/JD context, so cap items per prompt to stay in the context window
+    await asyncio.gather(*(
+        _answer_pending(pending[i:i + _BATCH_MAX_ITEMS], results, item_digests)
+        for i in range(0, len(pending), _BATCH_MAX_ITEMS)
+    ))
+    return results
+
+async def generate_gist_for_labels(parsed_resume: Dict[str, Any], jd_data: Dict[str, Any], labels: List[str]) -> Dict[str, str]:
+    """
+    Generates mapping label -> short answer.
+    parsed_resume: {"raw_text": "...", ...}
+    jd_data: {"job_description": "..."}
+    labels: list[str]
+    """
+    return (await generate_gist_batch([(parsed_resume, jd_data, labels)]))[0]
@@ -0,0 +1,53 @@
+# app/services/http_session.py
+import asyncio
+from typing import Callable, Dict, Set
+
+import aiohttp
+
+
+class LoopSessions:
+    """
+    One pooled aiohttp session per event loop (keep-alive reuses TCP/TLS connections).
+    A session only works on the loop that created it, so each loop gets its own; sessions of
+    loops that have since closed are closed on the next get(), and close() shuts them all.
+    """
+
+    def __init__(self, factory: Callable[[], aiohttp.ClientSession]):
+        self._factory = factory
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self._closing: Set[asyncio.Task] = set()
+
+    def get(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            self._close_dead_loops(loop)
+            session = self._factory()
+            self._sessions[loop] = session
+        return session
+
+    def _close_dead_loops(self, loop: asyncio.AbstractEventLoop) -> None:
+        for old_loop in [l for l in self._sessions if l.is_closed()]:
+            session = self._sessions.pop(old_loop)
+            if not session.closed:
+                # Its loop is gone, so nothing is in flight: close it from this loop
+                task = loop.create_task(session.close())
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
+
+    async def close(self) -> None:
+        current = asyncio.get_running_loop()
+        for loop, session in list(self._sessions.items()):
+            if session.closed:
+                del self._sessions[loop]
+            elif loop is current or loop.is_closed():
+                del self._sessions[loop]
+                await session.close()
+            elif loop.is_running():
+                # Owned by a loop running in another thread: close it there
+                del self._sessions[loop]
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.close(), loop))
+            # else: a stopped (not closed) loop may run again; its session stays until then
+        pending = [t for t in self._closing if t.get_loop() is current]
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
@@ -1,12 +1,18 @@
 # app/services/jd_fetcher.py
+import asyncio
+import functools
 import logging
+import os
 import re
 import urllib.parse
-from time import sleep
-from typing import Optional, Tuple, Dict, List
+from time import sleep, monotonic
+from typing import Optional, Tuple, Dict, List, Union
 
+import aiohttp
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
+
+from services.http_session import LoopSessions
 
 logger = logging.getLogger(__name__)
 
@@ -19,9 +25,49 @@ DEFAULT_HEADERS = {
     "Accept-Language": "en-US,en;q=0.9",
 }
 
+
+def _pick_parser() -> str:
+    # libxml2-backed parser is several times faster; fall back if lxml isn't installed
+    try:
+        import lxml  # noqa: F401
+        return "lxml"
+    except ImportError:
+        return "html.parser"
+
+
+_PARSER = _pick_parser()
+
+
+def _soup(html: str) -> BeautifulSoup:
+    return BeautifulSoup(html or "", _PARSER)
+
+
+NOISE_TAGS = ["script", "style", "noscript", "header", "footer", "form", "aside", "nav"]
+HEADER_TAGS = frozenset({"h1", "h2", "h3", "h4", "strong", "b"})
+LIST_TAGS = frozenset({"ul", "ol"})
+# Opening markup for any NOISE_TAGS element; clean payloads (e.g. the Greenhouse API body) have none
+NOISE_TAG_OPEN_RE = re.compile(r"<(?:%s)\b" % "|".join(NOISE_TAGS), re.I)
+
+
+def _clean_soup(html: str) -> BeautifulSoup:
+    """Parse once and drop non-content tags; the result can be passed around as a Tag."""
+    html = html or ""
+    soup = _soup(html)
+    # Skip the find_all walk when the markup can't contain a noise tag
+    if NOISE_TAG_OPEN_RE.search(html):
+        for tag in soup(NOISE_TAGS):
+            tag.decompose()
+    return soup
+
+
 MAX_RELEVANT_CHARS = 8000
 FETCHER_VERSION = "v1.5-greenhouse-cleanup"
 
+# Results of successful fetches, keyed by normalized URL: {url: (stored_at, result)}
+JD_CACHE_TTL = float(os.getenv("JD_CACHE_TTL", "600"))
+JD_CACHE_MAX_ENTRIES = 512
+_JD_CACHE: Dict[str, Tuple[float, dict]] = {}
+
 # Legacy keywords kept for potential future use; classification now uses HEADER_PATTERNS
 SECTION_KEYS = {
     "responsibilities": [
@@ -51,8 +97,34 @@ HEADER_PATTERNS = {
     ],
 }
 
+# All header patterns in one alternation, scanned once per header. Group names map back
+# to the section; HEADER_PATTERNS order is the priority when several sections match.
+HEADER_GROUPS = {}
+_header_alts = []
+for _sec, _pats in HEADER_PATTERNS.items():
+    for _i, _p in enumerate(_pats):
+        HEADER_GROUPS[f"{_sec}__{_i}"] = _sec
+        _header_alts.append(f"(?P<{_sec}__{_i}>{_p.pattern})")
+HEADER_RE = re.compile("|".join(_header_alts), re.I)
+SECTION_PRIORITY = {sec: i for i, sec in enumerate(HEADER_PATTERNS)}
+# Literal fragments, one of which every HEADER_RE match contains; most candidates have none
+HEADER_HINTS = (
+    "responsibilit", "what you", "day", "requirement", "qualification", "skills",
+    "what we", "thrive", "ideal", "who you", "nice", "preferred", "good", "bonus", "plus",
+)
+
 BONUS_FLAG_RE = re.compile(r"\b(nice to have|preferred|bonus|plus)\b", re.I)
 
+# Line-level hints used by the fallbacks when no section headers are found
+RESP_HINT_RE = re.compile(r"\b(you will|build|design|own|lead|implement|deliver)\b", re.I)
+SKILL_HINT_RE = re.compile(r"\b(require|must|experience|proficien|knowledge|background)\b", re.I)
+FALLBACK_SKILL_RE = re.compile(r"\b(experience|years|knowledge|proficient|familiar|strong|background|degree|bachelor|master)\b", re.I)
+
+BULLET_CHARS_RE = re.compile(r"[•·▪–—➤▶■□►]")
+BLANK_LINES_RE = re.compile(r"\n{3,}")
+# Each non-blank line with surrounding whitespace trimmed
+LINE_RE = re.compile(r"^[^\S\n]*(\S[^\n]*?)[^\S\n]*$", re.M)
+
 # Noise filter to drop EEO, social links, notices, etc.
 NOISE_RE = re.compile(
     r"(equal opportunity|affirmative action|\beeo\b|disabilit|veteran|"
@@ -63,6 +135,7 @@ NOISE_RE = re.compile(
 )
 
 
+@functools.lru_cache(maxsize=4096)
 def is_allowed_job_url(url: str) -> bool:
     try:
         p = urllib.parse.urlparse(url)
@@ -74,6 +147,7 @@ def is_allowed_job_url(url: str) -> bool:
         return False
 
 
+@functools.lru_cache(maxsize=4096)
 def parse_greenhouse_path(url: str) -> Tuple[Optional[str], Optional[str]]:
     p = urllib.parse.urlparse(url)
     q = urllib.parse.parse_qs(p.query)
@@ -101,15 +175,17 @@ def fetch_from_greenhouse_api(board_token: str, job_id: str, timeout: int = 20)
         return None
 
 
-def html_to_text_preserve_lists(html: str, include_divs: bool = False) -> str:
-    soup = BeautifulSoup(html or "", "html.parser")
-    for tag in soup(["script", "style", "noscript", "header", "footer", "form", "aside", "nav"]):
-        tag.decompose()
+def html_to_text_preserve_lists(html: Union[str, Tag], include_divs: bool = False) -> str:
+    # A Tag is used as-is (already parsed and cleaned by the caller)
+    root = html if isinstance(html, Tag) else _clean_soup(html)
     tags = ["h1", "h2", "h3", "h4", "p", "li", "blockquote"]
     if include_divs:
         tags.append("div")
+    elements = root.find_all(tags)
+    if root.name in tags:
+        elements.insert(0, root)
     lines = []
-    for el in soup.find_all(tags):
+    for el in elements:
         txt = el.get_text(" ", strip=True)
         if not txt:
             continue
@@ -118,24 +194,34 @@ def html_to_text_preserve_lists(html: str, include_divs: bool = False) -> str:
         else:
             lines.append(txt)
     text = "\n".join(lines)
-    text = re.sub(r"[•·▪–—➤▶■□►]", "-", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = BULLET_CHARS_RE.sub("-", text)
+    text = BLANK_LINES_RE.sub("\n\n", text)
     return text.strip()
 
 
 def classify_header(text: str) -> Optional[str]:
     t = " ".join(text.strip().lower().replace("’", "'").split())
-    for sec, pats in HEADER_PATTERNS.items():
-        if any(p.search(t) for p in pats):
-            return sec
-    return None
+    # Cheap substring check first (ASCII only: re.I also folds e.g. "ſ" to "s")
+    if t.isascii() and not any(h in t for h in HEADER_HINTS):
+        return None
+    best = None
+    for m in HEADER_RE.finditer(t):
+        sec = HEADER_GROUPS[m.lastgroup]
+        if best is None or SECTION_PRIORITY[sec] < SECTION_PRIORITY[best]:
+            best = sec
+            if SECTION_PRIORITY[best] == 0:
+                break
+    return best
 
 
-def _find_following_list(header):
+def _find_following_list(header, root=None):
     # If header is inside a <p> or <div> (common on GH), step up
     node = header
     if header.name in ("strong", "b") and header.parent and header.parent.name in ("p", "div"):
         node = header.parent
+    if node is root:
+        # don't walk out of the container we were given
+        return None
 
     # Walk a few next siblings, stop at next header-like block
     for idx, sib in enumerate(node.next_siblings):
@@ -150,18 +236,53 @@ def _find_following_list(header):
     return None
 
 
-def extract_sections_from_html(html: str) -> Dict[str, List[str]]:
-    out = {"responsibilities": [], "skills": [], "bonus_skills": []}
-    soup = BeautifulSoup(html or "", "html.parser")
-    for tag in soup(["script", "style", "noscript", "header", "footer", "form", "aside", "nav"]):
-        tag.decompose()
+def _dedup_and_limit(out: Dict[str, List[str]]) -> None:
+    # Case-insensitive dedup with whitespace collapsed; split/join avoids a regex per item
+    for k in out:
+        seen, dedup = set(), []
+        seen_add, dedup_append = seen.add, dedup.append
+        for item in out[k]:
+            item = " ".join(item.split())
+            low = item.lower()
+            if item and low not in seen:
+                seen_add(low)
+                dedup_append(item[:300])
+                if len(dedup) == 120:
+                    break
+        out[k] = dedup
 
-    # Only header-like tags; avoid <p> to reduce false positives
-    header_candidates = soup.find_all(["h1", "h2", "h3", "h4", "strong", "b"])
+
+def extract_sections_from_html(html: Union[str, Tag]) -> Dict[str, List[str]]:
+    out = {"responsibilities": [], "skills": [], "bonus_skills": []}
+    # A Tag is used as-is (already parsed and cleaned by the caller)
+    soup = html if isinstance(html, Tag) else _clean_soup(html)
 
     seen_lists = set()  # avoid assigning same UL/OL twice
+    all_lists, all_items = [], []  # every UL/OL and LI, in document order, for the scans below
+    li_texts = {}  # id(li) -> text; the header, fallback and bonus passes share each LI's text
+    seen_items = set()  # LIs already classified by the header pass
+
+    def li_text(li) -> str:
+        txt = li_texts.get(id(li))
+        if txt is None:
+            txt = li_texts[id(li)] = li.get_text(" ", strip=True)
+        return txt
+
+    # Single walk over the tree: classify headers inline, remember lists/items for later
+    for h in soup.descendants:
+        name = h.name
+        if name is None:
+            continue
+        if name in LIST_TAGS:
+            all_lists.append(h)
+            continue
+        if name == "li":
+            all_items.append(h)
+            continue
+        # Only header-like tags; avoid <p> to reduce false positives
+        if name not in HEADER_TAGS:
+            continue
 
-    for h in header_candidates:
         header_text = h.get_text(" ", strip=True)
         if not header_text:
             continue
@@ -169,7 +290,7 @@ def extract_sections_from_html(html: str) -> Dict[str, List[str]]:
         if not sec:
             continue
 
-        list_node = _find_following_list(h)
+        list_node = _find_following_list(h, soup)
         if not list_node:
             continue
         if id(list_node) in seen_lists:
@@ -177,7 +298,8 @@ def extract_sections_from_html(html: str) -> Dict[str, List[str]]:
         seen_lists.add(id(list_node))
 
         for li in list_node.find_all("li", recursive=True):
-            txt = li.get_text(" ", strip=True)
+            seen_items.add(id(li))
+            txt = li_text(li)
             if not txt or NOISE_RE.search(txt):
                 continue
             if BONUS_FLAG_RE.search(txt):
@@ -185,43 +307,37 @@ def extract_sections_from_html(html: str) -> Dict[str, List[str]]:
             else:
                 out[sec].append(txt)
 
-
-
-
     # ✅ NEW: Fallback - if skills section is empty, scan ALL lists for skill-like content
     if not out["skills"]:
         logger.warning("No skills found via headers, attempting fallback extraction")
-        all_lists = soup.find_all(["ul", "ol"])
+        found = set(out["skills"])
         for ul in all_lists:
             if id(ul) in seen_lists:
                 continue
             for li in ul.find_all("li", recursive=False):
-                txt = li.get_text(" ", strip=True)
+                txt = li_text(li)
                 if not txt or NOISE_RE.search(txt):
                     continue
                 # Heuristic: if contains skill-related keywords, add to skills
-                if re.search(r"\b(experience|years|knowledge|proficient|familiar|strong|background|degree|bachelor|master)\b", txt, re.I):
-                    if txt not in out["skills"]:
+                if FALLBACK_SKILL_RE.search(txt):
+                    if txt not in found:
+                        found.add(txt)
                         out["skills"].append(txt)
 
 
-    # Global scan for bonus-like bullets anywhere (keep, but filter noise)
-    for li in soup.find_all("li"):
-        txt = li.get_text(" ", strip=True)
+    # Global scan for bonus-like bullets anywhere (keep, but filter noise). LIs from the
+    # header pass are settled: bonus ones were already added, the rest never qualify.
+    found = set(out["bonus_skills"])
+    for li in all_items:
+        if id(li) in seen_items:
+            continue
+        txt = li_text(li)
         if txt and not NOISE_RE.search(txt) and BONUS_FLAG_RE.search(txt):
-            if txt not in out["bonus_skills"]:
+            if txt not in found:
+                found.add(txt)
                 out["bonus_skills"].append(txt)
 
-    # Dedup + limit
-    for k in out:
-        seen, dedup = set(), []
-        for item in out[k]:
-            item = re.sub(r"\s+", " ", item).strip()
-            low = item.lower()
-            if item and low not in seen:
-                seen.add(low)
-                dedup.append(item[:300])
-        out[k] = dedup[:120]
+    _dedup_and_limit(out)
 
     # ✅ NEW: Log what was extracted
     logger.info(f"Extracted sections - R:{len(out['responsibilities'])}, S:{len(out['skills'])}, B:{len(out['bonus_skills'])}")    
@@ -233,12 +349,12 @@ def parse_sections_from_text(text: str) -> Dict[str, List[str]]:
     # Heuristic text-only parser (fallback if HTML structure fails)
     out = {"responsibilities": [], "skills": [], "bonus_skills": []}
     txt = text.replace("\r\n", "\n").replace("\r", "\n")
-    txt = re.sub(r"[•·▪–—➤▶■□►]", "-", txt)
-    lines = [ln.strip() for ln in txt.split("\n") if ln.strip()]
+    txt = BULLET_CHARS_RE.sub("-", txt)
+    # One pass over the text: stripped non-empty lines, minus noise. A noise match
+    # never starts on a bullet marker, so the bullet-stripped content needs no re-check.
+    lines = [ln for ln in LINE_RE.findall(txt) if not NOISE_RE.search(ln)]
     current = None
     for ln in lines:
-        if NOISE_RE.search(ln):
-            continue
         if len(ln) < 120 and (":" not in ln) and (ln.isupper() or ln.istitle()):
             sec = classify_header(ln)
             if sec:
@@ -246,7 +362,7 @@ def parse_sections_from_text(text: str) -> Dict[str, List[str]]:
                 continue
         is_bullet = ln.startswith(("-", "*"))
         content = ln.lstrip("-* ").strip() if is_bullet else ln
-        if not content or NOISE_RE.search(content):
+        if not content:
             continue
         if BONUS_FLAG_RE.search(content):
             out["bonus_skills"].append(content)
@@ -263,79 +379,162 @@ def parse_sections_from_text(text: str) -> Dict[str, List[str]]:
         out["responsibilities"] = [
             ln.lstrip("- ").strip()
             for ln in lines
-            if re.search(r"\b(you will|build|design|own|lead|implement|deliver)\b", ln, re.I)
-            and not NOISE_RE.search(ln)
+            if RESP_HINT_RE.search(ln)
         ][:60]
     if not out["skills"]:
         out["skills"] = [
             ln.lstrip("- ").strip()
             for ln in lines
-            if re.search(r"\b(require|must|experience|proficien|knowledge|background)\b", ln, re.I)
+            if SKILL_HINT_RE.search(ln)
             and not BONUS_FLAG_RE.search(ln)
-            and not NOISE_RE.search(ln)
         ][:120]
 
-    # Dedup + limit
-    for k in out:
-        seen, dedup = set(), []
-        for item in out[k]:
-            item = re.sub(r"\s+", " ", item).strip()
-            low = item.lower()
-            if item and low not in seen:
-                seen.add(low)
-                dedup.append(item[:300])
-        out[k] = dedup[:120]
+    _dedup_and_limit(out)
     return out
 
 
-def extract_main_container_text(html: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
-    soup = BeautifulSoup(html, "html.parser")
-    for tag in soup(["script", "style", "noscript", "header", "footer", "form", "aside", "nav"]):
-        tag.decompose()
-    candidates = [
-        ("#content", soup.select_one("#content")),
-        ("div.opening", soup.select_one("div.opening")),
-        ("div.opening-body", soup.select_one("div.opening-body")),
-        ("div.job__description", soup.select_one("div.job__description")),
-        ("section#content", soup.select_one("section#content")),
-        ("section.content", soup.select_one("section.content")),
-        ("div.content", soup.select_one("div.content")),
-        ("div.section.page", soup.select_one("div.section.page")),
-        ("div.section-wrapper.page", soup.select_one("div.section-wrapper.page")),
-        ("[data-automation-id='jobDescription']", soup.select_one("[data-automation-id='jobDescription']")),
-    ]
-    best_txt, best_html, best_sel, best_len = None, None, None, 0
+def _outermost(root: Tag, name: str):
+    """Yield `name` tags under root that have no `name` ancestor (without descending into them)."""
+    stack = [iter(root.children)]
+    while stack:
+        for child in stack[-1]:
+            if child.name == name:
+                yield child
+            elif child.name:
+                stack.append(iter(child.children))
+                break
+        else:
+            stack.pop()
+
+
+# Known JD containers, in preference order: (selector, tag, id, classes, (attr, value))
+CONTAINER_SELECTORS = [
+    ("#content", None, "content", (), None),
+    ("div.opening", "div", None, ("opening",), None),
+    ("div.opening-body", "div", None, ("opening-body",), None),
+    ("div.job__description", "div", None, ("job__description",), None),
+    ("section#content", "section", "content", (), None),
+    ("section.content", "section", None, ("content",), None),
+    ("div.content", "div", None, ("content",), None),
+    ("div.section.page", "div", None, ("section", "page"), None),
+    ("div.section-wrapper.page", "div", None, ("section-wrapper", "page"), None),
+    ("[data-automation-id='jobDescription']", None, None, (), ("data-automation-id", "jobDescription")),
+]
+
+
+def _select_containers(soup) -> List[Tuple[str, Optional[Tag]]]:
+    """Same as select_one() per CONTAINER_SELECTORS, but in a single walk instead of one CSS scan each."""
+    found: Dict[str, Tag] = {}
+    pending = list(CONTAINER_SELECTORS)
+    for el in soup.descendants:
+        if el.name is None:
+            continue
+        attrs = el.attrs
+        matched = False
+        for spec in pending:
+            sel, name, id_, classes, attr = spec
+            if name is not None and el.name != name:
+                continue
+            if id_ is not None and attrs.get("id") != id_:
+                continue
+            if classes:
+                cls = attrs.get("class") or ()
+                if not all(c in cls for c in classes):
+                    continue
+            if attr is not None and attrs.get(attr[0]) != attr[1]:
+                continue
+            found[sel] = el
+            matched = True
+        if matched:
+            pending = [spec for spec in pending if spec[0] not in found]
+            if not pending:
+                break
+    return [(spec[0], found.get(spec[0])) for spec in CONTAINER_SELECTORS]
+
+
+def extract_main_container_text(html: str) -> Tuple[Optional[str], Optional[Tag], Optional[str]]:
+    """Returns (text, container Tag, selector); the Tag belongs to an already-cleaned soup."""
+    soup = _clean_soup(html)
+    candidates = _select_containers(soup)
+    best_txt, best_node, best_sel, best_len = None, None, None, 0
     for sel, node in candidates:
         if not node:
             continue
-        node_html = str(node)
-        txt = html_to_text_preserve_lists(node_html)
+        txt = html_to_text_preserve_lists(node)
         if txt and len(txt) > best_len and len(txt) > 200:
-            best_txt, best_html, best_sel, best_len = txt, node_html, sel, len(txt)
+            best_txt, best_node, best_sel, best_len = txt, node, sel, len(txt)
     if best_txt:
-        return best_txt, best_html, best_sel
-    # Fallback: largest div
-    best_txt, best_html, best_len = None, None, 0
-    for div in soup.find_all("div"):
-        node_html = str(div)
-        txt = html_to_text_preserve_lists(node_html)
+        return best_txt, best_node, best_sel
+    # Fallback: largest div. A div's text includes every line of its nested divs and
+    # ties keep the earlier (outer) div, so only outermost divs can win.
+    best_txt, best_node, best_len = None, None, 0
+    for div in _outermost(soup, "div"):
+        txt = html_to_text_preserve_lists(div)
         if txt and len(txt) > best_len and len(txt) > 200:
-            best_txt, best_html, best_len = txt, node_html, len(txt)
+            best_txt, best_node, best_len = txt, div, len(txt)
     if best_txt:
-        return best_txt, best_html, "fallback-largest-div"
+        return best_txt, best_node, "fallback-largest-div"
     return None, None, None
 
 
 def _relevant_snippet_from_sections(sections: Dict[str, List[str]]) -> str:
     lines = sections.get("responsibilities", []) + sections.get("skills", []) + sections.get("bonus_skills", [])
-    lines = [ln for ln in lines if not NOISE_RE.search(ln)]
-    text = "\n".join(lines).strip()
+    text = "\n".join(lines)
+    # Noise is nearly always filtered upstream: one scan of the joined text settles it,
+    # and only a hit (possibly from whitespace collapsed in dedup) needs the per-line pass
+    if NOISE_RE.search(text):
+        text = "\n".join(ln for ln in lines if not NOISE_RE.search(ln))
+    text = text.strip()
     if len(text) > MAX_RELEVANT_CHARS:
         text = text[:MAX_RELEVANT_CHARS]
     return text
 
 
+def _is_tracking_param(name: str) -> bool:
+    return name.startswith("utm_") or name == "gh_src"
+
+
+@functools.lru_cache(maxsize=4096)
+def _cache_key(url: str) -> str:
+    # scheme/host are case-insensitive, the fragment never reaches the server and
+    # tracking params (utm_*, gh_src) don't change which job is served
+    p = urllib.parse.urlsplit(url.strip())
+    query = p.query
+    if query:
+        pairs = urllib.parse.parse_qsl(query, keep_blank_values=True)
+        if any(_is_tracking_param(k) for k, _ in pairs):
+            query = urllib.parse.urlencode([(k, v) for k, v in pairs if not _is_tracking_param(k)])
+    return urllib.parse.urlunsplit((p.scheme.lower(), p.netloc.lower(), p.path, query, ""))
+
+
+def _cache_lookup(key: str) -> Optional[dict]:
+    hit = _JD_CACHE.get(key)
+    if hit and monotonic() - hit[0] < JD_CACHE_TTL:
+        return dict(hit[1])
+    return None
+
+
+def _cache_store(key: str, result: dict) -> None:
+    # Only successful fetches carry the HTML; don't pin errors in the cache
+    if JD_CACHE_TTL > 0 and "job_description_html" in result:
+        _JD_CACHE.pop(key, None)
+        while len(_JD_CACHE) >= JD_CACHE_MAX_ENTRIES:
+            _JD_CACHE.pop(next(iter(_JD_CACHE)))  # FIFO eviction
+        _JD_CACHE[key] = (monotonic(), result)
+
+
 def fetch_job_description(url: str, retries: int = 3, delay: int = 2):
+    key = _cache_key(url)
+    hit = _cache_lookup(key)
+    if hit is not None:
+        return hit
+
+    result = _fetch_job_description(url, retries=retries, delay=delay)
+    _cache_store(key, result)
+    return dict(result)
+
+
+def _guard_result(url: str) -> Optional[dict]:
     if "127.0.0.1:8000/fetch_jd" in url:
         return {
             "url": url,
@@ -352,6 +551,80 @@ def fetch_job_description(url: str, retries: int = 3, delay: int = 2):
             "jd_sections": {},
             "debug": f"{FETCHER_VERSION} url-not-allowed",
         }
+    return None
+
+
+def _api_result(resolved_url: str, board_token: str, job_id: str, api_html: str) -> dict:
+    # Parse once; text and section extraction share the cleaned tree
+    api_soup = _clean_soup(api_html)
+    api_text = html_to_text_preserve_lists(api_soup, include_divs=True)
+    if not api_text or len(api_text) < 80:
+        api_text2 = api_soup.get_text("\n", strip=True)
+        api_text2 = BULLET_CHARS_RE.sub("-", api_text2)
+        api_text2 = BLANK_LINES_RE.sub("\n\n", api_text2).strip()
+        if len(api_text2) > len(api_text):
+            api_text = api_text2
+
+    sections = extract_sections_from_html(api_soup)
+    if not any(sections.values()):
+        sections = parse_sections_from_text(api_text)
+    rel = _relevant_snippet_from_sections(sections)
+
+    return {
+        "url": resolved_url,
+        "job_description_full": api_text,      # TEXT ONLY
+        "job_description_relevant": rel,
+        "jd_sections": sections,
+        "job_description_html": api_html,       # optional
+        "debug": f"{FETCHER_VERSION} source=api board={board_token} job={job_id} api_html_len={len(api_html)} text_len={len(api_text)} secs={{r:{len(sections['responsibilities'])},s:{len(sections['skills'])},b:{len(sections['bonus_skills'])}}}",
+    }
+
+
+def _html_result(resolved_url: str, html: str) -> Optional[dict]:
+    # None when no container was found (caller retries)
+    full_text, container, selector_used = extract_main_container_text(html)
+    if not full_text:
+        return None
+
+    sections = extract_sections_from_html(container if container is not None else html)
+    if not any(sections.values()):
+        sections = parse_sections_from_text(full_text)
+    rel = _relevant_snippet_from_sections(sections)
+
+    return {
+        "url": resolved_url,
+        "job_description_full": full_text,       # TEXT ONLY
+        "job_description_relevant": rel,
+        "jd_sections": sections,
+        "job_description_html": str(container),  # optional
+        "debug": f"{FETCHER_VERSION} source=html selector={selector_used} secs={{r:{len(sections['responsibilities'])},s:{len(sections['skills'])},b:{len(sections['bonus_skills'])}}}",
+    }
+
+
+def _not_found_result(resolved_url: str) -> dict:
+    return {
+        "url": resolved_url,
+        "job_description_full": "Job description not found.",
+        "job_description_relevant": "",
+        "jd_sections": {},
+        "debug": f"{FETCHER_VERSION} no-selector",
+    }
+
+
+def _error_result(resolved_url: str, e: Exception) -> dict:
+    return {
+        "url": resolved_url,
+        "job_description_full": "Error occurred.",
+        "job_description_relevant": "",
+        "jd_sections": {},
+        "debug": f"{FETCHER_VERSION} error={e}",
+    }
+
+
+def _fetch_job_description(url: str, retries: int = 3, delay: int = 2):
+    guarded = _guard_result(url)
+    if guarded is not None:
+        return guarded
 
     headers = DEFAULT_HEADERS.copy()
     board_token, job_id = parse_greenhouse_path(url)
@@ -371,30 +644,7 @@ def fetch_job_description(url: str, retries: int = 3, delay: int = 2):
     if board_token and job_id:
         api_html = fetch_from_greenhouse_api(board_token, job_id)
         if api_html is not None:
-            api_text = html_to_text_preserve_lists(api_html, include_divs=True)
-            if not api_text or len(api_text) < 80:
-                soup = BeautifulSoup(api_html, "html.parser")
-                for tag in soup(["script", "style", "noscript", "header", "footer", "form", "aside", "nav"]):
-                    tag.decompose()
-                api_text2 = soup.get_text("\n", strip=True)
-                api_text2 = re.sub(r"[•·▪–—➤▶■□►]", "-", api_text2)
-                api_text2 = re.sub(r"\n{3,}", "\n\n", api_text2).strip()
-                if len(api_text2) > len(api_text):
-                    api_text = api_text2
-
-            sections = extract_sections_from_html(api_html)
-            if not any(sections.values()):
-                sections = parse_sections_from_text(api_text)
-            rel = _relevant_snippet_from_sections(sections)
-
-            return {
-                "url": resolved_url,
-                "job_description_full": api_text,      # TEXT ONLY
-                "job_description_relevant": rel,
-                "jd_sections": sections,
-                "job_description_html": api_html,       # optional
-                "debug": f"{FETCHER_VERSION} source=api board={board_token} job={job_id} api_html_len={len(api_html)} text_len={len(api_text)} secs={{r:{len(sections['responsibilities'])},s:{len(sections['skills'])},b:{len(sections['bonus_skills'])}}}",
-            }
+            return _api_result(resolved_url, board_token, job_id, api_html)
 
     # HTML fallback
     for attempt in range(1, retries + 1):
@@ -407,42 +657,116 @@ def fetch_job_description(url: str, retries: int = 3, delay: int = 2):
                 html = resolved_html
                 resolved_html = None
 
-            full_text, container_html, selector_used = extract_main_container_text(html)
-            if not full_text:
+            result = _html_result(resolved_url, html)
+            if result is None:
                 if attempt < retries:
                     sleep(delay)
                     continue
-                return {
-                    "url": resolved_url,
-                    "job_description_full": "Job description not found.",
-                    "job_description_relevant": "",
-                    "jd_sections": {},
-                    "debug": f"{FETCHER_VERSION} no-selector",
-                }
-
-            sections = extract_sections_from_html(container_html or html)
-            if not any(sections.values()):
-                sections = parse_sections_from_text(full_text)
-            rel = _relevant_snippet_from_sections(sections)
-
-            return {
-                "url": resolved_url,
-                "job_description_full": full_text,       # TEXT ONLY
-                "job_description_relevant": rel,
-                "jd_sections": sections,
-                "job_description_html": container_html,  # optional
-                "debug": f"{FETCHER_VERSION} source=html selector={selector_used} secs={{r:{len(sections['responsibilities'])},s:{len(sections['skills'])},b:{len(sections['bonus_skills'])}}}",
-            }
+                return _not_found_result(resolved_url)
+            return result
 
         except requests.exceptions.RequestException as e:
             logger.warning("Fetch attempt failed: %s", e)
             if attempt < retries:
                 sleep(delay)
             else:
-                return {
-                    "url": resolved_url,
-                    "job_description_full": "Error occurred.",
-                    "job_description_relevant": "",
-                    "jd_sections": {},
-                    "debug": f"{FETCHER_VERSION} error={e}",
-                }
\ No newline at end of file
+                return _error_result(resolved_url, e)
+
+
+# -----------------------------
+# Async fetching (pooled connections)
+# -----------------------------
+# One pooled session per event loop: keep-alive reuses TCP/TLS connections across JD fetches
+_sessions = LoopSessions(lambda: aiohttp.ClientSession(
+    connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=60),
+    headers=DEFAULT_HEADERS,
+))
+
+def _get_session() -> aiohttp.ClientSession:
+    return _sessions.get()
+
+async def close_session():
+    await _sessions.close()
+
+
+async def fetch_from_greenhouse_api_async(
+    session: aiohttp.ClientSession, board_token: str, job_id: str, timeout: int = 20
+) -> Optional[str]:
+    api_url = f"https://boards-api.greenhouse.io/v1/boards/{board_token}/jobs/{job_id}?content=true"
+    try:
+        async with session.get(api_url, headers=DEFAULT_HEADERS, timeout=aiohttp.ClientTimeout(total=timeout)) as r:
+            r.raise_for_status()
+            data = await r.json(content_type=None)
+        html = data.get("content")
+        if not html and isinstance(data.get("job_post"), dict):
+            html = data["job_post"].get("content")
+        return html
+    except Exception as e:
+        logger.warning("Greenhouse API fetch failed (%s): %s", api_url, e)
+        return None
+
+
+async def fetch_job_description_async(
+    url: str, session: Optional[aiohttp.ClientSession] = None, retries: int = 3, delay: int = 2
+):
+    """Async twin of fetch_job_description; BS4 parsing runs in a worker thread."""
+    key = _cache_key(url)
+    hit = _cache_lookup(key)
+    if hit is not None:
+        return hit
+
+    result = await _fetch_job_description_async(url, session or _get_session(), retries, delay)
+    _cache_store(key, result)
+    return dict(result)
+
+
+async def _fetch_job_description_async(url: str, session: aiohttp.ClientSession, retries: int, delay: int):
+    guarded = _guard_result(url)
+    if guarded is not None:
+        return guarded
+
+    headers = DEFAULT_HEADERS.copy()
+    board_token, job_id = parse_greenhouse_path(url)
+
+    resolved_url = url
+    resolved_html = None
+    if not (board_token and job_id):
+        try:
+            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=20), allow_redirects=True) as r0:
+                resolved_url = str(r0.url)
+                resolved_html = await r0.text(errors="replace")
+        except Exception as e:
+            logger.warning("Failed to resolve redirects for %s: %s", url, e)
+        board_token, job_id = parse_greenhouse_path(resolved_url)
+
+    # API path
+    if board_token and job_id:
+        api_html = await fetch_from_greenhouse_api_async(session, board_token, job_id)
+        if api_html is not None:
+            return await asyncio.to_thread(_api_result, resolved_url, board_token, job_id, api_html)
+
+    # HTML fallback
+    for attempt in range(1, retries + 1):
+        try:
+            if resolved_html is None:
+                async with session.get(resolved_url, headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as resp:
+                    resp.raise_for_status()
+                    html = await resp.text(errors="replace")
+            else:
+                html = resolved_html
+                resolved_html = None
+
+            result = await asyncio.to_thread(_html_result, resolved_url, html)
+            if result is None:
+                if attempt < retries:
+                    await asyncio.sleep(delay)
+                    continue
+                return _not_found_result(resolved_url)
+            return result
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning("Fetch attempt failed: %s", e)
+            if attempt < retries:
+                await asyncio.sleep(delay)
+            else:
+                return _error_result(resolved_url, e)
@@ -4,6 +4,14 @@ import json
 import logging
 import aiohttp
 
+from services.http_session import LoopSessions
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 HF_GEMMA_URL = os.getenv("HF_GEMMA_URL")  # e.g. https://router.huggingface.co/v1/chat/completions
@@ -12,9 +20,19 @@ HF_GEMMA_MODEL = os.getenv("HF_GEMMA_MODEL", "google/gemma-2-9b-it")
 
 last_llm_used = "gemma"
 
-async def call_gpt_model(prompt: str) -> str:
+# One pooled session per event loop: reuses the TCP/TLS connection across LLM calls
+_sessions = LoopSessions(aiohttp.ClientSession)
+
+def _get_session() -> aiohttp.ClientSession:
+    return _sessions.get()
+
+async def close_session():
+    await _sessions.close()
+
+async def call_gpt_model(prompt: str, max_tokens: int = 400) -> str:
     """
     Sends the prompt to Gemma-2-9B-Instruct via Hugging Face API.
+    max_tokens: completion budget (batched prompts need more room).
     Returns the generated text response.
     """
     if not HF_GEMMA_KEY or not HF_GEMMA_URL:
@@ -32,28 +50,26 @@ async def call_gpt_model(prompt: str) -> str:
             {"role": "user", "content": prompt}
         ],
         "stream": False,
-        "max_tokens": 400,
+        "max_tokens": max_tokens,
         "temperature": 0.5
     }
 
     try:
         logger.info("🧠 Sending prompt to Gemma (Hugging Face API)...")
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(HF_GEMMA_URL, headers=headers, json=payload, timeout=90) as response:
-                result_text = await response.text()
-
-                if response.status != 200:
-                    logger.error(f"❌ Gemma API Error {response.status}: {result_text}")
-                    return f"LLM call failed ({response.status})"
+        session = _get_session()
+        async with session.post(HF_GEMMA_URL, headers=headers, json=payload, timeout=90) as response:
+            if response.status != 200:
+                logger.error(f"❌ Gemma API Error {response.status}: {await response.text()}")
+                return f"LLM call failed ({response.status})"
 
-                result = json.loads(result_text)
-                logger.info("✅ Got response from Gemma model.")
+            result = await response.json(loads=_json_loads, content_type=None)
+            logger.info("✅ Got response from Gemma model.")
 
-                # Extract the text response
-                if "choices" in result and len(result["choices"]) > 0:
-                    return result["choices"][0]["message"]["content"].strip()
-                return json.dumps(result, indent=2)
+            # Extract the text response
+            if "choices" in result and len(result["choices"]) > 0:
+                return result["choices"][0]["message"]["content"].strip()
+            return json.dumps(result, indent=2)
 
     except Exception as e:
         logger.error(f"❌ Gemma request failed: {e}")
@@ -2,18 +2,24 @@
 from __future__ import annotations
 import os
 import re
+import math
+import hashlib
 import pathlib
+import functools
+import heapq
+import threading
+import time
+from collections import Counter, OrderedDict
 from typing import Dict, List, Tuple, Optional, Set
 from loguru import logger
 
 import torch
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.feature_extraction import text as sk_text
-from sentence_transformers import SentenceTransformer, util
+from sentence_transformers import SentenceTransformer
 
 # Use your parser service (supports PDF + DOCX)
-from services.skill_normalizer import normalize_skills
+from services.skill_normalizer import normalize_skills, get_normalizer_model, NORMALIZER_MODEL_NAME
 from datetime import datetime
 
 STOPWORDS = sk_text.ENGLISH_STOP_WORDS
@@ -58,15 +64,31 @@ ALIASES = {
 def apply_aliases(token: str) -> str:
     return ALIASES.get(token, token)
 
+# ⚡ Compiled once instead of per call
+PREPROC_STRIP_RE = re.compile(r"[^a-z0-9\s\+\#\-\.]")
+PREPROC_WS_RE = re.compile(r"\s+")
+STOPWORDS_SET = frozenset(STOPWORDS)
+# ⚡ ASCII fast path: lowercase + strip in one bytes.translate (A-Z -> a-z, kept chars as-is,
+# everything else -> space); str.split() then collapses whitespace and trims in the same pass
+_PREPROC_KEEP = b"abcdefghijklmnopqrstuvwxyz0123456789+#-. \t\n\r\x0b\x0c"
+_PREPROC_ASCII_TABLE = bytes(
+    o if o in _PREPROC_KEEP else o + 32 if 65 <= o <= 90 else 32
+    for o in range(256)
+)
+
+@functools.lru_cache(maxsize=256)
 def preprocess_text(s: str) -> str:
-    s = s.lower()
-    s = re.sub(r"[^a-z0-9\s\+\#\-\.]", " ", s)
-    s = re.sub(r"\s+", " ", s)
-    return s.strip()
+    if s.isascii():
+        return " ".join(s.encode("ascii").translate(_PREPROC_ASCII_TABLE).decode("ascii").split())
+    return PREPROC_WS_RE.sub(" ", PREPROC_STRIP_RE.sub(" ", s.lower())).strip()
 
 def tokenize_and_filter(s: str) -> set[str]:
-    words = set(s.split())
-    return {w for w in words if w not in STOPWORDS and len(w) > 2}
+    stop = STOPWORDS_SET
+    return {w for w in s.split() if len(w) > 2 and w not in stop}
+
+def tokenize_batch(texts: List[str]) -> List[set[str]]:
+    """Preprocess + tokenize many docs (e.g. several resumes against one JD)."""
+    return [tokenize_and_filter(preprocess_text(t)) for t in texts]
 
 # -----------------------------
 # Resume text extraction
@@ -102,6 +124,35 @@ MONTHS = {
     "dec": 12, "december": 12
 }
 
+YEAR_RE = re.compile(r'\b(19|20)\d{2}\b')
+# Every MONTHS key starts with its 3-letter abbreviation, so one search finds the month
+MONTH_RE = re.compile(r'jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec')
+PRESENT_RE = re.compile(r'present|current|now|ongoing')
+NOW_MONTHS = (CURRENT_YEAR * 12) + CURRENT_MONTH
+
+# JD requirements: "3-5 years", "3 to 5 years"
+YOE_RANGE_RE = re.compile(r'(\d{1,2})\s*(?:[-–—]|to)\s*(\d{1,2})\s*(?:\+)?\s*(?:years?|yrs?)')
+# JD requirements, one pass; alternatives in priority order:
+# "5+ years" (plus), "minimum 3 years" (min), "3 years of experience" (exp)
+YOE_JD_SINGLE_RE = re.compile(
+    r'(?P<plus>\d{1,2})\+\s*(?:years?|yrs?)'
+    r'|(?:minimum|min|at least)\s*(?:of\s*)?(?P<min>\d{1,2})\s*(?:years?|yrs?)'
+    r'|(?P<exp>\d{1,2})\s*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)'
+)
+# Resume employment date ranges: "Jan 2020 - Mar 2022 / present / now" or "2018 - 2020 / present"
+_MONTH_YEAR = r'\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\w*\s+\d{4}'
+RESUME_DATE_RE = re.compile(
+    r'(?P<start>' + _MONTH_YEAR + r')\s*(?:[-–—]|to)\s*(?P<end>' + _MONTH_YEAR + r'|present|current|now)'
+    r'|(?P<ystart>\b(?:19|20)\d{2})\s*(?:[-–—]|to)\s*(?P<yend>\b(?:19|20)\d{2}|present|current)',
+    re.IGNORECASE,
+)
+# Resume fallback: explicit mentions, "5 years of experience" (exp) before "over 5 years" (about).
+# about_exp catches "over 5 years of experience", which also counts as an exp mention.
+YOE_EXPLICIT_RE = re.compile(
+    r'(?P<exp>\d{1,2})\+?\s*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)'
+    r'|(?:with|over|around)\s*(?P<about>\d{1,2})\+?\s*(?:years?|yrs?)(?P<about_exp>\s*(?:of\s*)?(?:experience|exp))?'
+)
+
 def parse_date_to_months(date_str: str) -> int:
     """
     Convert a date string to total months from year 0.
@@ -110,26 +161,24 @@ def parse_date_to_months(date_str: str) -> int:
     date_str = date_str.lower().strip()
     
     # Handle "present", "current", "now"
-    if any(word in date_str for word in ["present", "current", "now", "ongoing"]):
-        return (CURRENT_YEAR * 12) + CURRENT_MONTH
+    if PRESENT_RE.search(date_str):
+        return NOW_MONTHS
     
     # Try to extract year (required)
-    year_match = re.search(r'\b(19|20)\d{2}\b', date_str)
+    year_match = YEAR_RE.search(date_str)
     if not year_match:
         return 0
     
     year = int(year_match.group(0))
     
     # Try to extract month
-    month = 1  # Default to January if month not specified
-    for month_name, month_num in MONTHS.items():
-        if month_name in date_str:
-            month = month_num
-            break
+    month_match = MONTH_RE.search(date_str)
+    month = MONTHS[month_match.group(0)] if month_match else 1  # Default to January if month not specified
     
     return (year * 12) + month
 
 
+@functools.lru_cache(maxsize=256)
 def extract_years_of_experience(text: str, source: str = "resume"):
     """
     Enhanced YoE extraction with better accuracy.
@@ -147,8 +196,7 @@ def extract_years_of_experience(text: str, source: str = "resume"):
     # ============================================
     if source == "jd":
         # Pattern 1: "3-5 years", "3 to 5 years"
-        range_pattern = r'(\d{1,2})\s*(?:[-–—]|to)\s*(\d{1,2})\s*(?:\+)?\s*(?:years?|yrs?)'
-        range_matches = re.findall(range_pattern, text)
+        range_matches = YOE_RANGE_RE.findall(text)
         
         for low_str, high_str in range_matches:
             try:
@@ -158,22 +206,20 @@ def extract_years_of_experience(text: str, source: str = "resume"):
             except:
                 continue
         
-        # Pattern 2: "5+ years", "minimum 3 years"
-        single_patterns = [
-            r'(\d{1,2})\+\s*(?:years?|yrs?)',
-            r'(?:minimum|min|at least)\s*(?:of\s*)?(\d{1,2})\s*(?:years?|yrs?)',
-            r'(\d{1,2})\s*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)',
-        ]
-        
-        for pattern in single_patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
-                try:
-                    yoe = int(match)
-                    if 0 < yoe <= 50:
-                        return float(yoe)
-                except:
-                    continue
+        # Pattern 2: "5+ years", "minimum 3 years" - single scan, first valid match per kind
+        found = {}
+        for m in YOE_JD_SINGLE_RE.finditer(text):
+            kind = m.lastgroup
+            if kind in found:
+                continue
+            yoe = int(m.group(kind))
+            if 0 < yoe <= 50:
+                found[kind] = float(yoe)
+                if kind == "plus":
+                    break
+        for kind in ("plus", "min", "exp"):
+            if kind in found:
+                return found[kind]
     
     # ============================================
     # RESUME-SPECIFIC: Calculate from job history
@@ -182,65 +228,58 @@ def extract_years_of_experience(text: str, source: str = "resume"):
         date_ranges = []
         
         # Enhanced date range patterns
-        patterns = [
-            r'(\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\w*\s+\d{4})\s*(?:[-–—]|to)\s*(\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\w*\s+\d{4}|present|current)',
-            r'(\b(?:19|20)\d{2})\s*(?:[-–—]|to)\s*(\b(?:19|20)\d{2}|present|current)',
-            r'(\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\w*\s+\d{4})\s*(?:[-–—]|to)\s*(present|current|now)',
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for start_str, end_str in matches:
+        for m in RESUME_DATE_RE.finditer(text):
+            if m.group('start'):
+                starts, end_str = [m.group('start')], m.group('end')
+                # "Mon YYYY - present": the year-only pattern has always matched the
+                # "YYYY - present" tail too (counting from January); keep that interval
+                if end_str in ('present', 'current'):
+                    year_match = YEAR_RE.search(m.group('start'))
+                    if year_match:
+                        starts.append(year_match.group(0))
+            else:
+                starts, end_str = [m.group('ystart')], m.group('yend')
+
+            end_months = parse_date_to_months(end_str)
+            for start_str in starts:
                 start_months = parse_date_to_months(start_str)
-                end_months = parse_date_to_months(end_str)
-                
-                if start_months > 0 and end_months > 0 and end_months >= start_months:
-                    duration_months = end_months - start_months
-                    duration_years = duration_months / 12.0
-                    
-                    if 0 < duration_years <= 50:
-                        date_ranges.append({
-                            'start': start_months,
-                            'end': end_months,
-                            'duration': duration_years
-                        })
+
+                # (start, end) month pairs, at most 50 years long
+                if start_months > 0 and end_months > 0 and 0 < end_months - start_months <= 600:
+                    date_ranges.append((start_months, end_months))
         
         # Remove overlapping periods
         if date_ranges:
-            date_ranges.sort(key=lambda x: x['start'])
+            date_ranges.sort()
             
             merged = []
-            for current in date_ranges:
-                if not merged:
-                    merged.append(current)
+            cur_start, cur_end = date_ranges[0]
+            for start, end in date_ranges[1:]:
+                if start <= cur_end:
+                    if end > cur_end:
+                        cur_end = end
                 else:
-                    last = merged[-1]
-                    if current['start'] <= last['end']:
-                        last['end'] = max(last['end'], current['end'])
-                        last['duration'] = (last['end'] - last['start']) / 12.0
-                    else:
-                        merged.append(current)
+                    merged.append((cur_start, cur_end))
+                    cur_start, cur_end = start, end
+            merged.append((cur_start, cur_end))
             
-            total_years = sum(period['duration'] for period in merged)
+            total_years = sum((end - start) / 12.0 for start, end in merged)
             
             if total_years > 0:
                 return round(total_years, 1)
         
-        # Fallback: explicit mentions
-        explicit_patterns = [
-            r'(\d{1,2})\+?\s*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)',
-            r'(?:with|over|around)\s*(\d{1,2})\+?\s*(?:years?|yrs?)',
-        ]
-        
-        for pattern in explicit_patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
-                try:
-                    yoe = int(match)
-                    if 0 < yoe <= 50:
-                        return float(yoe)
-                except:
-                    continue
+        # Fallback: explicit mentions - single scan, "N years of experience" wins over "over N years"
+        about = None
+        for m in YOE_EXPLICIT_RE.finditer(text):
+            yoe = int(m.group('exp') or m.group('about'))
+            if not 0 < yoe <= 50:
+                continue
+            if m.group('exp') or m.group('about_exp'):
+                return float(yoe)
+            if about is None:
+                about = float(yoe)
+        if about is not None:
+            return about
     
     return 0.0
 
@@ -253,16 +292,138 @@ def extract_years_of_experience(text: str, source: str = "resume"):
 # Semantic model 
 # -----------------------------
 _MODEL_NAME = os.getenv("SENTENCE_MODEL", "all-MiniLM-L6-v2")
+# "onnx" runs the encoder on ONNX Runtime (needs sentence-transformers[onnx]); default is PyTorch
+_MODEL_BACKEND = os.getenv("SENTENCE_BACKEND", "torch").lower()
+# Optional ONNX file in the model repo, e.g. "onnx/model_qint8_avx512_vnni.onnx" for int8
+_ONNX_FILE = os.getenv("SENTENCE_ONNX_FILE", "")
+# Half precision encode: fp16 weights on CUDA, bf16 autocast on CPU (pays off on AMX/AVX512-BF16).
+# Only cosine rankings consume the embeddings, so the precision loss is negligible; off by default.
+_HALF_PRECISION = str(os.getenv("MATCHER_HALF_PRECISION", "0")).lower() not in {"0", "false", "no"}
+# torch.compile the encoder at load (slower startup, faster encodes); off by default
+_TORCH_COMPILE = str(os.getenv("MATCHER_TORCH_COMPILE", "0")).lower() not in {"0", "false", "no"}
 _semantic_model: SentenceTransformer | None = None
 
+# CPU threading: intra-op threads for the encoder (default: torch's own choice, one per
+# physical core); inter-op kept at 1 since encode() runs a single graph at a time
+_TORCH_THREADS = os.getenv("MATCHER_TORCH_THREADS")
+if _TORCH_THREADS:
+    torch.set_num_threads(max(1, int(_TORCH_THREADS)))
+try:
+    torch.set_num_interop_threads(1)
+except RuntimeError:
+    pass  # already set, or inter-op work has started
+
+def _load_sentence_model() -> SentenceTransformer:
+    # Same model as the skill normalizer (same backend settings): share its instance instead of
+    # holding a second copy. Not when fp16 is on, since .half() would change the normalizer's dtype.
+    if _MODEL_NAME == NORMALIZER_MODEL_NAME and not _HALF_PRECISION:
+        return get_normalizer_model()
+    if _MODEL_BACKEND == "onnx":
+        try:
+            model_kwargs = {"file_name": _ONNX_FILE} if _ONNX_FILE else {}
+            return SentenceTransformer(_MODEL_NAME, backend="onnx", model_kwargs=model_kwargs)
+        except Exception as e:
+            logger.warning(f"⚠️ ONNX backend unavailable ({e}); falling back to PyTorch")
+    return SentenceTransformer(_MODEL_NAME)
+
+_model_lock = threading.Lock()
+
 def get_model() -> SentenceTransformer:
     global _semantic_model
     if _semantic_model is None:
-        print("🔄 Loading sentence transformer model...")
-        _semantic_model = SentenceTransformer(_MODEL_NAME)
-        print("✅ Model loaded successfully")
+        # Scoring runs in worker threads; load once even if several requests race here
+        with _model_lock:
+            if _semantic_model is None:
+                print("🔄 Loading sentence transformer model...")
+                model = _load_sentence_model()
+                model.eval()
+                if _HALF_PRECISION and _MODEL_BACKEND == "torch" and model.device.type == "cuda":
+                    model.half()
+                if _TORCH_COMPILE and _MODEL_BACKEND == "torch":
+                    _compile_encoder(model)
+                _semantic_model = model
+                print("✅ Model loaded successfully")
     return _semantic_model
 
+def _compile_encoder(model: SentenceTransformer) -> None:
+    """torch.compile the transformer (fused kernels) and warm it up at load, not on the first request."""
+    if not hasattr(torch, "compile"):
+        return
+    module = model._first_module()
+    eager = module.auto_model
+    try:
+        mode = "max-autotune" if model.device.type == "cuda" else "default"
+        module.auto_model = torch.compile(eager, mode=mode, dynamic=True, fullgraph=False)
+        model.encode(["warmup"] * 2, show_progress_bar=False)
+        logger.info(f"⚡ Encoder compiled with torch.compile (mode={mode})")
+    except Exception as e:
+        module.auto_model = eager
+        logger.warning(f"⚠️ torch.compile failed ({e}); using eager encoder")
+
+def _encode(model: SentenceTransformer, texts: List[str]) -> torch.Tensor:
+    # inference_mode over encode()'s own no_grad: also skips version counters / view tracking
+    with torch.inference_mode():
+        if _HALF_PRECISION and _MODEL_BACKEND == "torch" and model.device.type == "cpu":
+            # bf16 matmuls on CPU; normalize in fp32 afterwards (bf16 norms lose precision)
+            with torch.autocast(device_type="cpu", dtype=torch.bfloat16):
+                emb = model.encode(texts, batch_size=32, convert_to_tensor=True,
+                                   normalize_embeddings=False, show_progress_bar=False)
+            return torch.nn.functional.normalize(emb.float(), p=2, dim=1)
+        return model.encode(texts, batch_size=32, convert_to_tensor=True,
+                            normalize_embeddings=True, show_progress_bar=False)
+
+# ⚡ Micro-batching: concurrent scoring threads share one model.encode call. The first caller
+# waits MATCHER_ENCODE_BATCH_MS for others to queue, then encodes everything queued so far.
+_ENCODE_BATCH_WAIT = float(os.getenv("MATCHER_ENCODE_BATCH_MS", "5")) / 1000.0
+_encode_queue: List["_EncodeRequest"] = []
+_encode_queue_lock = threading.Lock()
+_encode_leader_active = False
+
+class _EncodeRequest:
+    __slots__ = ("texts", "done", "result", "error")
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.done = threading.Event()
+        self.result: Optional[torch.Tensor] = None
+        self.error: Optional[BaseException] = None
+
+def _encode_coalesced(texts: List[str]) -> torch.Tensor:
+    global _encode_leader_active
+    if _ENCODE_BATCH_WAIT <= 0:
+        return _encode(get_model(), texts)
+
+    req = _EncodeRequest(texts)
+    with _encode_queue_lock:
+        _encode_queue.append(req)
+        leader = not _encode_leader_active
+        _encode_leader_active = True
+    if not leader:
+        req.done.wait()
+        if req.error is not None:
+            raise req.error
+        return req.result
+
+    time.sleep(_ENCODE_BATCH_WAIT)
+    with _encode_queue_lock:
+        batch = _encode_queue[:]
+        _encode_queue.clear()
+        _encode_leader_active = False
+    try:
+        emb = _encode(get_model(), [t for r in batch for t in r.texts])
+    except BaseException as e:
+        for r in batch:
+            r.error = e
+            r.done.set()
+        raise
+    start = 0
+    for r in batch:
+        # Copy out of the shared batch tensor so a cached result doesn't pin its siblings' memory
+        r.result = emb[start:start + len(r.texts)].clone() if len(batch) > 1 else emb
+        start += len(r.texts)
+        r.done.set()
+    return req.result
+
 # ✅ PRE-LOAD MODEL ON MODULE IMPORT (during server startup)
 # Only pre-load if semantic matching is enabled for score calculation
 if USE_SEMANTIC_SCORE:
@@ -287,88 +448,276 @@ def chunk_text_words(text: str, chunk_size: int = 220, overlap: int = 40) -> Lis
         i += step
     return chunks
 
+# Upper bound on chunks encoded per text (0 = no cap); very long resumes keep their longest chunks
+_MAX_CHUNKS = int(os.getenv("MATCHER_MAX_CHUNKS", "0"))
+
+def _cap_chunks(chunks: List[str]) -> List[str]:
+    if _MAX_CHUNKS <= 0 or len(chunks) <= _MAX_CHUNKS:
+        return chunks
+    keep = sorted(range(len(chunks)), key=lambda i: -chunks[i].count(" "))[:_MAX_CHUNKS]
+    return [chunks[i] for i in sorted(keep)]  # back in document order
+
+# ⚡ Embedding cache: identical resume/JD text skips the transformer forward pass entirely
+_EMB_CACHE_SIZE = int(os.getenv("MATCHER_EMB_CACHE_SIZE", "2048"))
+_emb_cache: "OrderedDict[Tuple[str, int, int], Tuple[List[str], torch.Tensor]]" = OrderedDict()
+_emb_cache_lock = threading.Lock()
+
+def _text_digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8", "ignore"), digest_size=16).hexdigest()
+
+def _emb_cache_get(key: Tuple[str, int, int]):
+    with _emb_cache_lock:
+        hit = _emb_cache.get(key)
+        if hit is not None:
+            _emb_cache.move_to_end(key)
+        return hit
+
+def _emb_cache_put(key: Tuple[str, int, int], value: Tuple[List[str], torch.Tensor]):
+    if _EMB_CACHE_SIZE <= 0:
+        return
+    with _emb_cache_lock:
+        _emb_cache[key] = value
+        _emb_cache.move_to_end(key)
+        while len(_emb_cache) > _EMB_CACHE_SIZE:
+            _emb_cache.popitem(last=False)
+
+_empty_emb: Optional[torch.Tensor] = None
+
+def _empty_embedding() -> torch.Tensor:
+    """(0, dim) embedding for text with no chunks, built once instead of encoding [""]."""
+    global _empty_emb
+    if _empty_emb is None:
+        model = get_model()
+        _empty_emb = torch.zeros((0, model.get_sentence_embedding_dimension() or 0), device=model.device)
+    return _empty_emb
+
+def embed_chunks_many(texts: List[Tuple[str, int, int]]) -> List[Tuple[List[str], torch.Tensor]]:
+    """embed_chunks for several (text, chunk_size, overlap) at once: one model.encode over all uncached chunks."""
+    if not USE_SEMANTIC_SCORE:
+        # No model in fast mode; empty embeddings score 0 downstream
+        return [([], torch.zeros(0)) for _ in texts]
+    results: List[Optional[Tuple[List[str], torch.Tensor]]] = [None] * len(texts)
+    pending = []  # (index, cache key, chunks)
+    for i, (text, chunk_size, overlap) in enumerate(texts):
+        key = (_text_digest(text), chunk_size, overlap)
+        hit = _emb_cache_get(key)
+        if hit is not None:
+            results[i] = hit
+            continue
+        chunks = _cap_chunks(chunk_text_words(text, chunk_size=chunk_size, overlap=overlap))
+        if not chunks:
+            results[i] = (chunks, _empty_embedding())
+        else:
+            pending.append((i, key, chunks))
+
+    if pending:
+        # Concatenate every text's chunks and remember each slice
+        flat, spans = [], []
+        for _, _, chunks in pending:
+            start = len(flat)
+            flat.extend(chunks)
+            spans.append((start, len(flat)))
+        emb = _encode_coalesced(flat)
+        for (i, key, chunks), (start, end) in zip(pending, spans):
+            # Own copy per text: cache entries are evicted one at a time, a view would keep the whole batch alive
+            results[i] = (chunks, emb[start:end].clone() if len(pending) > 1 else emb)
+            _emb_cache_put(key, results[i])
+    return results
+
 def embed_chunks(text: str, chunk_size: int = 220, overlap: int = 40):
-    model = get_model()
-    chunks = chunk_text_words(text, chunk_size=chunk_size, overlap=overlap)
-    if not chunks:
-        return [], model.encode([""], convert_to_tensor=True, normalize_embeddings=True)
-    emb = model.encode(chunks, convert_to_tensor=True, normalize_embeddings=True)
-    return chunks, emb
+    return embed_chunks_many([(text, chunk_size, overlap)])[0]
+
+# Same tokenizer/stop words TfidfVectorizer(stop_words="english") uses
+_TFIDF_ANALYZER = TfidfVectorizer(stop_words="english").build_analyzer()
+# Smoothed IDF when fitting on exactly two docs: ln(3/2) + 1 for a term in one doc, 1 for both
+_TFIDF_IDF_UNSHARED = math.log(1.5) + 1.0
+
+@functools.lru_cache(maxsize=256)
+def _term_counts(text: str) -> Dict[str, int]:
+    # Cached: the resume is compared against every JD section (treat result as read-only)
+    return dict(Counter(_TFIDF_ANALYZER(text)))
 
 def tfidf_score(a: str, b: str) -> float:
+    """Cosine of TfidfVectorizer(stop_words="english").fit_transform([a, b]), computed from term counts."""
     if not a.strip() or not b.strip():
         return 0.0
-    try:
-        vec = TfidfVectorizer(stop_words="english")
-        mat = vec.fit_transform([a, b])
-        score = cosine_similarity(mat[0:1], mat[1:2])[0][0] * 100.0
-        return float(score) if score == score else 0.0
-    except Exception:
+    ca, cb = _term_counts(a), _term_counts(b)
+    if not ca or not cb:
         return 0.0
+    wa = {t: n * (1.0 if t in cb else _TFIDF_IDF_UNSHARED) for t, n in ca.items()}
+    wb = {t: n * (1.0 if t in ca else _TFIDF_IDF_UNSHARED) for t, n in cb.items()}
+    dot = sum(w * wb[t] for t, w in wa.items() if t in wb)
+    if not dot:
+        return 0.0
+    norm = math.sqrt(sum(w * w for w in wa.values())) * math.sqrt(sum(w * w for w in wb.values()))
+    return dot / norm * 100.0
+
+SECTION_CHUNK_SIZE, SECTION_CHUNK_OVERLAP = 160, 30
 
-def semantic_score_against_chunks(resume_chunks_emb: torch.Tensor, section_text: str) -> float:
+def semantic_score_against_chunks(resume_chunks_emb: torch.Tensor, section_text: str,
+                                  sec_emb: Optional[torch.Tensor] = None) -> float:
     if not USE_SEMANTIC_SCORE:
         return 0.0
     if not section_text.strip():
         return 0.0
-    _, sec_emb = embed_chunks(section_text, chunk_size=160, overlap=30)
+    if sec_emb is None:
+        _, sec_emb = embed_chunks(section_text, chunk_size=SECTION_CHUNK_SIZE, overlap=SECTION_CHUNK_OVERLAP)
     if sec_emb.size(0) == 0 or resume_chunks_emb.size(0) == 0:
         return 0.0
-    sims = util.cos_sim(sec_emb, resume_chunks_emb)
-    topk = min(3, sims.size(-1))
-    topk_vals, _ = torch.topk(sims, k=topk, dim=-1)
-    return float(topk_vals.mean().item()) * 100.0
-
-def section_match(resume_text_norm: str, resume_chunks_emb: torch.Tensor, section_text_raw: str) -> Tuple[float, float, float]:
-    tfidf = tfidf_score(resume_text_norm, preprocess_text(section_text_raw))
-    sem = semantic_score_against_chunks(resume_chunks_emb, section_text_raw) if USE_SEMANTIC_SCORE else 0.0
+    # encode() already runs without autograd; keep the similarity math out of it too
+    with torch.inference_mode():
+        # Embeddings are L2-normalized, so cosine similarity is a plain matmul
+        sims = torch.mm(sec_emb, resume_chunks_emb.transpose(0, 1))
+        if sims.size(-1) <= 3:
+            # top-3 of at most 3 columns is every column
+            return float(sims.mean().item()) * 100.0
+        topk_vals, _ = torch.topk(sims, k=3, dim=-1, sorted=False)
+        return float(topk_vals.mean().item()) * 100.0
+
+# Skip the semantic encode when TF-IDF already decides the section (see _decisive_semantic).
+# On by default; MATCHER_FAST_PATH=0 always runs the encoder.
+_FAST_PATH = str(os.getenv("MATCHER_FAST_PATH", "1")).lower() not in {"0", "false", "no"}
+
+def _decisive_semantic(tfidf: float, section_text_raw: str) -> Optional[float]:
+    """Semantic score to use without encoding, or None when the encoder is needed.
+
+    TF-IDF >= 95 reuses the TF-IDF score (semantic can barely move it); TF-IDF <= 3 on a
+    short section scores 0. In both cases raw_section_scores.semantic is this stand-in.
+    """
+    if not _FAST_PATH:
+        return None
+    if tfidf >= 95.0:
+        return tfidf
+    if tfidf <= 3.0 and len(section_text_raw) < 200:
+        return 0.0
+    return None
+
+def section_match(resume_text_norm: str, resume_chunks_emb: torch.Tensor, section_text_raw: str,
+                  section_emb: Optional[torch.Tensor] = None,
+                  tfidf: Optional[float] = None) -> Tuple[float, float, float]:
+    return section_match_batch(
+        resume_text_norm, resume_chunks_emb, [section_text_raw], [section_emb],
+        None if tfidf is None else [tfidf],
+    )[0]
+
+def section_match_batch(resume_text_norm: str, resume_chunks_emb: torch.Tensor, sections_raw: List[str],
+                        section_embs: Optional[List[Optional[torch.Tensor]]] = None,
+                        tfidfs: Optional[List[float]] = None) -> List[Tuple[float, float, float]]:
+    """section_match for several sections; all semantic scores come from one matmul against the resume chunks."""
+    if tfidfs is None:
+        tfidfs = [tfidf_score(resume_text_norm, preprocess_text(raw)) for raw in sections_raw]
+    section_embs = list(section_embs or [None] * len(sections_raw))
+    sems = [0.0] * len(sections_raw)
+
+    if USE_SEMANTIC_SCORE:
+        todo = []  # sections TF-IDF doesn't decide and that have text
+        for i, (raw, tfidf) in enumerate(zip(sections_raw, tfidfs)):
+            shortcut = _decisive_semantic(tfidf, raw)
+            if shortcut is not None:
+                sems[i] = shortcut
+            elif raw.strip():
+                todo.append(i)
+        missing = [i for i in todo if section_embs[i] is None]
+        if missing:
+            embedded = embed_chunks_many([(sections_raw[i], SECTION_CHUNK_SIZE, SECTION_CHUNK_OVERLAP) for i in missing])
+            for i, (_, emb) in zip(missing, embedded):
+                section_embs[i] = emb
+        todo = [i for i in todo if section_embs[i].size(0)]
+        if todo and resume_chunks_emb.size(0):
+            with torch.inference_mode():
+                # ⚡ Stack every section's chunks: one matmul + one topk, then average each section's rows
+                sims = torch.mm(torch.cat([section_embs[i] for i in todo]), resume_chunks_emb.transpose(0, 1))
+                top = sims if sims.size(-1) <= 3 else torch.topk(sims, k=3, dim=-1, sorted=False)[0]
+                start = 0
+                for i in todo:
+                    end = start + section_embs[i].size(0)
+                    sems[i] = float(top[start:end].mean().item()) * 100.0
+                    start = end
+
     # If semantic is disabled, use TF-IDF only (faster)
-    combined = (0.6 * sem) + (0.4 * tfidf) if USE_SEMANTIC_SCORE else tfidf
-    return combined, tfidf, sem
+    return [
+        ((0.6 * sem) + (0.4 * tfidf) if USE_SEMANTIC_SCORE else tfidf, tfidf, sem)
+        for tfidf, sem in zip(tfidfs, sems)
+    ]
 
 # -----------------------------
 # Skill extraction
 # -----------------------------
-TECH_SKILLS = {
+TECH_SKILLS = frozenset({
     "python","java","c++","c#","javascript","typescript","react","reactjs","nextjs","next","angular","vue",
     "node","nodejs","express","django","flask","spring","kubernetes","docker","aws","azure","gcp","sql",
     "mysql","postgresql","nosql","mongodb","graphql","rest","api","jenkins","git","devops","html","css",
     "sass","less","bootstrap","tailwind","linux","tensorflow","pytorch","nlp","machinelearning","ml","ai",
     "spark","hadoop","pandas","numpy","kafka","redis","webpack","babel","vite","eslint","jest","rtl",
     "cypress","storybook","redux","frontend","ui","ux","designsystems","postgres"
-}
-NOISE_TOKENS = {
+})
+NOISE_TOKENS = frozenset({
     "instagram","linkedin","facebook","twitter","com","www","http","https","hackerrank",
     "race","color","gender","sex","origin","disability","identity","veteran","applicants",
     "life","day","ability","world","record","notice","customers"
-}
+})
+
+# Phrases that mark a JD "skill" as a sentence fragment rather than a skill
+SENTENCE_PHRASES = (
+    'experience with', 'working with', 'familiar with', 'comfortable with',
+    'you will', "you'll", 'collaborate', 'mentor', 'improve workflows',
+    'ability to', 'strong', 'excellent', 'good', 'knowledge of'
+)
+# ⚡ One alternation scan instead of a substring test per phrase
+SENTENCE_PHRASES_RE = re.compile("|".join(map(re.escape, SENTENCE_PHRASES)))
+# Looser set for the direct-missing fallback
+FALLBACK_PHRASES_RE = re.compile("experience|working|familiar|comfortable|you|collaborate")
 
 # Generic domain terms that are too broad to be actionable skills
-GENERIC_DOMAIN_TERMS = {
+GENERIC_DOMAIN_TERMS = frozenset({
     "frontend", "backend", "fullstack", "full-stack", "full stack",
     "ui", "ux", "devops", "cloud", "web", "mobile", "desktop",
     "software", "development", "engineering", "programming", "coding"
+})
+
+# ⚡ Token -> skill for every token that survives the noise/length filter and aliases to a
+# known skill, so extraction is one dict lookup per token
+SKILL_TOKEN_MAP = {
+    tok: apply_aliases(tok)
+    for tok in TECH_SKILLS | ALIASES.keys()
+    if tok not in NOISE_TOKENS and len(tok) > 2 and apply_aliases(tok) in TECH_SKILLS
 }
 
 def extract_skills_simple(text_raw: str) -> set[str]:
-    t = preprocess_text(text_raw)
-    tokens = set(t.split())
-    tokens |= {tok.replace(".", "") for tok in tokens}
-    tokens = {apply_aliases(tok) for tok in tokens if tok not in NOISE_TOKENS and len(tok) > 2}
-    return {s for s in TECH_SKILLS if s in tokens}
+    # Copy: callers may mutate the result, the cached set is shared
+    return set(_extract_skills_cached(text_raw))
+
+@functools.lru_cache(maxsize=256)
+def _extract_skills_cached(text_raw: str) -> frozenset[str]:
+    # Cached: the same JD (and resume) is scored repeatedly across requests
+    found = set()
+    lookup = SKILL_TOKEN_MAP.get
+    for tok in set(preprocess_text(text_raw).split()):
+        skill = lookup(tok)
+        if skill:
+            found.add(skill)
+        if "." in tok:
+            # "node.js" -> "nodejs" style variants
+            skill = lookup(tok.replace(".", ""))
+            if skill:
+                found.add(skill)
+    return frozenset(found)
 
 # -----------------------------
 # Deduplication helper
 # -----------------------------
-def dedupe_normalized(norm_list: List[Tuple[str, str, float]]) -> List[Tuple[str, str, float]]:
-    """Deduplicate by (category, skill)"""
+def dedupe_normalized(norm_list: List[Tuple]) -> List[Tuple]:
+    """Deduplicate by (skill..., category); the trailing score is ignored.
+
+    Works for both (skill, cat, score) and (resume_skill, jd_skill, cat, score) entries.
+    """
     seen = set()
     deduped = []
-    for skill, cat, score in norm_list:
-        key = (skill.lower(), cat.lower())
+    for entry in norm_list:
+        key = tuple(x.lower() for x in entry[:-1])
         if key not in seen:
             seen.add(key)
-            deduped.append((skill, cat, score))
+            deduped.append(entry)
     return deduped
 
 # -----------------------------
@@ -394,34 +743,33 @@ def calculate_match_score_text(
         }
 
     resume_text_norm = preprocess_text(resume_text_raw)
-    _, resume_chunks_emb = embed_chunks(resume_text_raw, chunk_size=220, overlap=40) if USE_SEMANTIC_SCORE else ([], torch.zeros(0))
 
     def join(name: str) -> str:
         return "\n".join(jd_sections.get(name, []) or [])
 
     jd_resp_raw, jd_skills_raw = join("responsibilities"), join("skills")
 
-    # ✅ NEW: If no skills section found, extract from full text
-    if not jd_skills_raw.strip() and jd_full_text:
-        logger.warning("Skills section empty, extracting from full JD text")
-        jd_skill_terms = extract_skills_simple(jd_full_text)
-    else:
-        # Extract skills from jd_skills_extracted - these might be full sentences, so extract technical skills from them
-        if jd_skills_extracted:
-            # jd_skills_extracted contains raw text from JD skills section (could be sentences)
-            # Extract technical skills from each item, then combine
-            extracted_skills = set()
-            for item in jd_skills_extracted:
-                if isinstance(item, str):
-                    # Extract technical skills from this sentence/item
-                    skills_from_item = extract_skills_simple(item)
-                    extracted_skills.update(skills_from_item)
-            jd_skill_terms = extracted_skills if extracted_skills else extract_skills_simple(jd_skills_raw)
-        else:
-            jd_skill_terms = extract_skills_simple(jd_skills_raw)
+    raw_by_name = {"resp": jd_resp_raw, "skills": jd_skills_raw}
+    tfidf_by_name = {name: tfidf_score(resume_text_norm, preprocess_text(raw)) for name, raw in raw_by_name.items()}
 
-    resp_combined, resp_tfidf, resp_sem = section_match(resume_text_norm, resume_chunks_emb, jd_resp_raw)
-    skills_combined, skills_tfidf, skills_sem = section_match(resume_text_norm, resume_chunks_emb, jd_skills_raw)
+    # ⚡ One encode call for the resume and every non-empty JD section TF-IDF doesn't already decide
+    resume_chunks_emb, section_embs = torch.zeros(0), {}
+    sections = [
+        name for name, raw in raw_by_name.items()
+        if raw.strip() and _decisive_semantic(tfidf_by_name[name], raw) is None
+    ] if USE_SEMANTIC_SCORE else []
+    if sections:
+        embedded = embed_chunks_many(
+            [(resume_text_raw, 220, 40)]
+            + [(raw_by_name[name], SECTION_CHUNK_SIZE, SECTION_CHUNK_OVERLAP) for name in sections]
+        )
+        resume_chunks_emb = embedded[0][1]
+        section_embs = {name: emb for name, (_, emb) in zip(sections, embedded[1:])}
+
+    (resp_combined, resp_tfidf, resp_sem), (skills_combined, skills_tfidf, skills_sem) = section_match_batch(
+        resume_text_norm, resume_chunks_emb, [jd_resp_raw, jd_skills_raw],
+        [section_embs.get("resp"), section_embs.get("skills")], [tfidf_by_name["resp"], tfidf_by_name["skills"]],
+    )
 
     #ats_score = (0.5 * resp_combined) + (0.5 * skills_combined)
 
@@ -435,20 +783,19 @@ def calculate_match_score_text(
     if jd_skills_extracted:
         # jd_skills_extracted contains raw text from JD skills section (could be sentences)
         # Extract technical skills from each item, then combine
-        extracted_skills = set()
-        for item in jd_skills_extracted:
-            if isinstance(item, str):
-                # Extract technical skills from this sentence/item
-                skills_from_item = extract_skills_simple(item)
-                extracted_skills.update(skills_from_item)
+        # ⚡ Tokens never span lines, so one pass over the joined items equals the per-item union;
+        # when the items are the skills section itself this is a cache hit on jd_skills_raw
+        items = [item for item in jd_skills_extracted if isinstance(item, str)]
+        extracted_skills = extract_skills_simple("\n".join(items)) if items else set()
         jd_skill_terms = extracted_skills if extracted_skills else extract_skills_simple(jd_skills_raw)
     else:
         jd_skill_terms = extract_skills_simple(jd_skills_raw)
     
-    logger.info(f"🔍 JD skills extracted: {len(jd_skill_terms)} skills, sample: {list(jd_skill_terms)[:10]}")
+    logger.opt(lazy=True).info("🔍 JD skills extracted: {} skills, sample: {}", lambda: len(jd_skill_terms), lambda: list(jd_skill_terms)[:10])
    
-    common = sorted(list(resume_skills & jd_skill_terms))[:30]
-    missing = sorted(list(jd_skill_terms - resume_skills))[:30]
+    # ⚡ First 30 in sorted order without sorting the whole set
+    common = heapq.nsmallest(30, resume_skills & jd_skill_terms)
+    missing = heapq.nsmallest(30, jd_skill_terms - resume_skills)
     logger.info(f"🔍 Common skills: {len(common)}, Missing skills (before filters): {len(missing)}, sample: {missing[:10]}")
     
     # Filter missing skills to remove any that look like job descriptions (safety check)
@@ -480,7 +827,6 @@ def calculate_match_score_text(
     normalized_missing = []
 
     resume_cats = {c for (_, c, s) in resume_norm if s >= 0.6}
-    jd_cats = {c for (_, c, s) in jd_norm if s >= 0.6}
 
     '''
     # Contextual overlap (category-based)
@@ -491,15 +837,24 @@ def calculate_match_score_text(
     '''
 
     # Contextual overlap (category-based) - avoid duplicates
+    # ⚡ JD skills indexed by category (in JD order): each resume skill only visits its own category
+    jd_by_cat: Dict[str, List[str]] = {}
+    for j, jc, js in jd_norm:
+        if jc != "other":
+            jd_by_cat.setdefault(jc, []).append(j)
     seen_pairs = set()
     for r, rc, rs in resume_norm:
-        for j, jc, js in jd_norm:
-            if rc != "other" and rc == jc:
-                # Create normalized pair key (sorted to avoid A↔B vs B↔A duplicates)
-                pair_key = tuple(sorted([r.lower(), j.lower()]))
-                if pair_key not in seen_pairs:
-                    seen_pairs.add(pair_key)
-                    normalized_overlap.append((f"{r} ↔ {j}", rc, 1.0))
+        if rc == "other":
+            continue
+        r_low = r.lower()
+        for j in jd_by_cat.get(rc, ()):
+            # Create normalized pair key (sorted to avoid A↔B vs B↔A duplicates)
+            j_low = j.lower()
+            pair_key = (r_low, j_low) if r_low <= j_low else (j_low, r_low)
+            if pair_key not in seen_pairs:
+                seen_pairs.add(pair_key)
+                # ⚡ Keep both sides; the "r ↔ j" display string is only built for the result
+                normalized_overlap.append((r, j, rc, 1.0))
                 
 
     # Contextual missing (JD categories not present in resume)
@@ -509,11 +864,8 @@ def calculate_match_score_text(
             # Filter out long sentences and job description phrases
             if len(j) <= 30 and j not in NOISE_TOKENS and j not in GENERIC_DOMAIN_TERMS:
                 # Additional filter: exclude if it looks like a sentence/phrase
-                if not any(phrase in j.lower() for phrase in [
-                    'experience with', 'working with', 'familiar with', 'comfortable with',
-                    'you will', "you'll", 'collaborate', 'mentor', 'improve workflows',
-                    'ability to', 'strong', 'excellent', 'good', 'knowledge of'
-                ]):
+                j_low = j.lower()
+                if not SENTENCE_PHRASES_RE.search(j_low):
                     normalized_missing.append((j, jc, js))
 
     normalized_overlap = dedupe_normalized(normalized_overlap)
@@ -526,21 +878,17 @@ def calculate_match_score_text(
         for m in missing[:10]:  # Limit to top 10
             if len(m) <= 30 and m not in GENERIC_DOMAIN_TERMS:
                 # Quick check: if it's a known tech skill or looks like one
-                if any(char.isalnum() for char in m) and not any(phrase in m.lower() for phrase in [
-                    'experience', 'working', 'familiar', 'comfortable', 'you', 'collaborate'
-                ]):
+                if any(char.isalnum() for char in m) and not FALLBACK_PHRASES_RE.search(m.lower()):
                     normalized_missing.append((m, "other", 0.5))  # Default category and score
 
     # --- FIX: Only remove EXACT matches, not contextual ---
     # Get skills from normalized_overlap that are from JD side
-    covered_jd_terms = set()
-    for pair, cat, score in normalized_overlap:
-        parts = pair.split("↔")
-        if len(parts) == 2:
-            resume_skill, jd_skill = parts[0].strip().lower(), parts[1].strip().lower()
-            # Only mark as covered if it's an exact match
-            if resume_skill == jd_skill:
-                covered_jd_terms.add(jd_skill)
+    # Only mark as covered if it's an exact match
+    covered_jd_terms = {
+        j.strip().lower()
+        for r, j, _, _ in normalized_overlap
+        if r.strip().lower() == j.strip().lower()
+    }
 
     # Keep skills that aren't exactly matched
     missing = [m for m in missing if m.lower() not in covered_jd_terms]
@@ -550,11 +898,10 @@ def calculate_match_score_text(
     # -----------------------------
     direct_skill_score = min(100.0, (len(common) / max(1, len(jd_skill_terms))) * 100.0)
     contextual_skill_score = min(100.0, (len(normalized_overlap) / max(1, len(jd_norm))) * 100.0)
-    all_matched_skills = sorted({
-        r.strip().lower()
-        for (pair, _, _) in normalized_overlap
-        for r in [pair.split("↔")[0]]  # only resume-side skill
-    } | {c.strip().lower() for c in common})
+    all_matched_skills = sorted(
+        {r.strip().lower() for r, _, _, _ in normalized_overlap}  # only resume-side skill
+        | {c.strip().lower() for c in common}
+    )
 
      # -----------------------------
     # YoE scoring with ranges
@@ -701,8 +1048,8 @@ def calculate_match_score_text(
         "common_skills": common,
         "missing_skills": missing,
 
-        "jd_skills_used": sorted(list(jd_skill_terms))[:50],
-        "normalized_overlap": normalized_overlap,
+        "jd_skills_used": heapq.nsmallest(50, jd_skill_terms),
+        "normalized_overlap": [(f"{r} ↔ {j}", cat, score) for r, j, cat, score in normalized_overlap],
         "normalized_missing": normalized_missing,
         "direct_skill_score": round(direct_skill_score, 2),
         "contextual_skill_score": round(contextual_skill_score, 2),
@@ -730,3 +1077,23 @@ def calculate_match_score_text(
         }
     }
 
+
+def calculate_match_scores_batch(
+    resume_texts_raw: List[str],
+    jd_sections: Dict[str, List[str]],
+    jd_skills_extracted: Optional[List[str]] = None,
+    debug: bool = False,
+    jd_full_text: str = ""
+) -> List[dict]:
+    """Score many resumes against one JD; semantic mode encodes every resume and JD section in one call."""
+    if USE_SEMANTIC_SCORE and 0 < len(resume_texts_raw) <= _EMB_CACHE_SIZE:
+        # ⚡ Warm the embedding cache with a single encode; the per-resume scoring below hits it
+        sections = ["\n".join(jd_sections.get(name, []) or []) for name in ("responsibilities", "skills")]
+        embed_chunks_many(
+            [(t, 220, 40) for t in resume_texts_raw if t and t.strip()]
+            + [(raw, SECTION_CHUNK_SIZE, SECTION_CHUNK_OVERLAP) for raw in sections if raw.strip()]
+        )
+    return [
+        calculate_match_score_text(t, jd_sections, jd_skills_extracted, debug=debug, jd_full_text=jd_full_text)
+        for t in resume_texts_raw
+    ]
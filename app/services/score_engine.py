@@ -1,10 +1,103 @@
 # services/score_engine.py
-from typing import Dict, Any, List
+import asyncio
+import functools
+import hashlib
+import json
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional
 from services import matcher
 from services.skill_normalizer import normalize_skills
 from loguru import logger
 from services.llm_client import call_gpt_model
 
+# Matcher in separate processes (parallel across cores, no GIL); 0 = worker threads in this process.
+# Each process loads its own model and caches, so size this to available memory.
+_PROCESS_WORKERS = int(os.getenv("SCORE_PROCESS_WORKERS", "0"))
+_executor: Optional[ProcessPoolExecutor] = None
+
+# LLM-written score explanation (adds an external API call per request); off = local template
+_LLM_EXPLANATION = str(os.getenv("SCORE_LLM_EXPLANATION", "0")).lower() not in {"0", "false", "no"}
+
+def _preload_matcher():
+    # Runs once per worker process: load the encoder before the first request lands there
+    if matcher.USE_SEMANTIC_SCORE:
+        matcher.get_model()
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn: fresh interpreter per worker instead of forking torch's thread pools
+        _executor = ProcessPoolExecutor(
+            max_workers=_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_preload_matcher,
+        )
+    return _executor
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+# ⚡ Matcher results for exact (resume, JD) repeats; 0 disables
+_RESULT_CACHE_SIZE = int(os.getenv("SCORE_RESULT_CACHE_SIZE", "256"))
+_result_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+
+def _result_key(resume_text_raw: str, jd_sections: Dict[str, List[str]], jd_full_text: str) -> Optional[bytes]:
+    try:
+        jd_key = json.dumps(jd_sections, sort_keys=True, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return None
+    h = hashlib.blake2b(digest_size=16)
+    for part in (resume_text_raw, jd_key, jd_full_text):
+        h.update(part.encode("utf-8", "surrogatepass"))
+        h.update(b"\x00")
+    return h.digest()
+
+def _cached_result(key: Optional[bytes]) -> Optional[Dict[str, Any]]:
+    if key is None or key not in _result_cache:
+        return None
+    _result_cache.move_to_end(key)
+    return _result_cache[key]
+
+def _store_result(key: Optional[bytes], result: Dict[str, Any]):
+    # Low scores are mostly extraction failures; don't pin those
+    if key is None or _RESULT_CACHE_SIZE <= 0 or float(result.get("ats_score", 0.0)) < 10.0:
+        return
+    _result_cache[key] = result
+    while len(_result_cache) > _RESULT_CACHE_SIZE:
+        _result_cache.popitem(last=False)
+
+async def prewarm_resume_embedding(parsed_resume: Dict[str, Any]) -> None:
+    """
+    Embed the resume ahead of scoring, e.g. while the JD is still being fetched.
+    The matcher's embedding cache picks the result up, so scoring only encodes the JD.
+    Runs before the JD is known, so it still encodes when the pair later hits the result cache.
+    """
+    resume_text_raw = parsed_resume.get("raw_text", "")
+    if not (matcher.USE_SEMANTIC_SCORE and matcher._EMB_CACHE_SIZE > 0):
+        return
+    if _PROCESS_WORKERS > 0:
+        # Worker processes each have their own embedding cache; warming this one helps nobody
+        return
+    if not isinstance(resume_text_raw, str) or not resume_text_raw.strip():
+        return
+    try:
+        await asyncio.to_thread(matcher.embed_chunks, resume_text_raw, 220, 40)
+    except Exception as e:
+        # Scoring will just encode the resume itself
+        logger.debug(f"Resume embedding prewarm failed: {e}")
+
+def _template_explanation(out: Dict[str, Any]) -> str:
+    """Explanation built from the matcher output (no LLM call)."""
+    matched = ", ".join(out["common_skills"][:5]) or "none"
+    missing = ", ".join(out["missing_skills"][:5]) or "none"
+    return f"Scored {out['score']:.1f}. Matched: {matched}. Missing: {missing}."
+
 async def compute_resume_score(parsed_resume: Dict[str, Any],
                                jd_sections: Dict[str, List[str]],
                                jd_full_text: str = "") -> Dict[str, Any]:
@@ -26,18 +119,42 @@ async def compute_resume_score(parsed_resume: Dict[str, Any],
     # We will extract jd_skills_extracted from jd_sections['skills']
     jd_skills_extracted = jd_sections.get("skills", []) if isinstance(jd_sections, dict) else []
 
+    # Same resume against the same JD (re-submits, retries) -> reuse the matcher result
+    cache_key = _result_key(resume_text_raw, jd_sections, jd_full_text)
+    result = _cached_result(cache_key)
+
+    # ⚡ The explanation doesn't depend on the score: run the LLM call while the matcher works
+    explanation_task = None
+    if _LLM_EXPLANATION:
+        explanation_prompt = f"""Summarize how well this resume matches the given job.
+Resume summary: {parsed_resume.get('raw_text', '')[:1500]}
+JD summary: {jd_full_text[:1500]}
+Return a short (2-3 sentence) actionable explanation listing top matched skills and top missing skills.
+"""
+        explanation_task = asyncio.create_task(call_gpt_model(explanation_prompt))
+
     # call matcher function
-    try:
-        result = matcher.calculate_match_score_text(
+    if result is None:
+        score_call = functools.partial(
+            matcher.calculate_match_score_text,
             resume_text_raw=resume_text_raw,
             jd_sections=jd_sections,
             jd_skills_extracted=jd_skills_extracted,
             jd_full_text=jd_full_text,
             debug=False
         )
-    except Exception as e:
-        logger.error(f"matcher.calculate_match_score_text failed: {e}")
-        raise
+        try:
+            if _PROCESS_WORKERS > 0:
+                result = await asyncio.get_running_loop().run_in_executor(_get_executor(), score_call)
+            else:
+                # Off the event loop: other requests keep being served, and concurrent encodes batch up
+                result = await asyncio.to_thread(score_call)
+        except Exception as e:
+            logger.error(f"matcher.calculate_match_score_text failed: {e}")
+            if explanation_task is not None:
+                explanation_task.cancel()
+            raise
+        _store_result(cache_key, result)
 
     # Format the returned result into the ScoreResponse-compatible dict
     out = {
@@ -59,15 +176,12 @@ async def compute_resume_score(parsed_resume: Dict[str, Any],
         "all_matched_skills": result.get("all_matched_skills", []),
     }
 
-    # Optional: get short natural-language explanation using LLM
+    # Optional: short natural-language explanation from the LLM (started above)
+    if explanation_task is None:
+        out["explanation"] = _template_explanation(out)
+        return out
     try:
-        explanation_prompt = f"""Summarize why this resume scored {out['score']} for the given job.
-Resume summary: {parsed_resume.get('raw_text', '')[:1500]}
-JD summary: {jd_full_text[:1500]}
-Return a short (2-3 sentence) actionable explanation listing top matched skills and top missing skills.
-"""
-        explanation = await call_gpt_model(explanation_prompt)
-        out["explanation"] = explanation
+        out["explanation"] = await explanation_task
     except Exception as e:
         logger.debug(f"LLM explanation generation failed: {e}")
         out["explanation"] = out.get("summary", "")
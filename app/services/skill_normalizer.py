@@ -1,17 +1,42 @@
 # app/services/skill_normalizer.py
-from sentence_transformers import SentenceTransformer, util
+from sentence_transformers import SentenceTransformer
+import functools
+import hashlib
+import json
 import os
+import tempfile
+import threading
+from collections import OrderedDict
+import torch
 
 
-# Lazy load model
+# Lazy load model (the matcher reuses this instance when it runs the same model)
+NORMALIZER_MODEL_NAME = "all-MiniLM-L6-v2"
 _model = None
+_model_lock = threading.Lock()
+# Same encoder backend switches as the matcher: SENTENCE_BACKEND=onnx with e.g.
+# SENTENCE_ONNX_FILE=onnx/model_qint8_avx512_vnni.onnx runs the normalizer on int8 ONNX Runtime
+_MODEL_BACKEND = os.getenv("SENTENCE_BACKEND", "torch").lower()
+_ONNX_FILE = os.getenv("SENTENCE_ONNX_FILE", "")
+
+def _load_normalizer_model():
+    if _MODEL_BACKEND == "onnx":
+        try:
+            model_kwargs = {"file_name": _ONNX_FILE} if _ONNX_FILE else {}
+            return SentenceTransformer(NORMALIZER_MODEL_NAME, backend="onnx", model_kwargs=model_kwargs)
+        except Exception as e:
+            print(f"⚠️ ONNX backend unavailable for normalizer ({e}); falling back to PyTorch")
+    return SentenceTransformer(NORMALIZER_MODEL_NAME)
 
 def get_normalizer_model():
     global _model
     if _model is None:
-        print("🔄 Loading normalizer model...")
-        _model = SentenceTransformer("all-MiniLM-L6-v2")
-        print("✅ Normalizer model loaded")
+        # Loaded from request threads and the matcher; make sure only one copy is ever built
+        with _model_lock:
+            if _model is None:
+                print("🔄 Loading normalizer model...")
+                _model = _load_normalizer_model()
+                print("✅ Normalizer model loaded")
     return _model
 
 # Pre-load if semantic matching enabled for normalizer
@@ -44,6 +69,105 @@ def _get_category_embeddings(category, examples):
             _category_embeddings_cache[category] = None
     return _category_embeddings_cache[category]
 
+# All category examples stacked into one matrix: (category names, matrix, category id per row).
+# Rows are L2-normalized once here, so scoring is a plain matmul instead of util.cos_sim.
+_category_matrix_cache = None
+# The matrix is also kept on disk (keyed by model, backend and CATEGORIES) so a fresh process
+# doesn't encode every category example again; empty = no disk cache
+_EMB_CACHE_DIR = os.getenv("NORMALIZER_EMB_CACHE_DIR", tempfile.gettempdir())
+
+def _category_matrix_path():
+    key = json.dumps([NORMALIZER_MODEL_NAME, _MODEL_BACKEND, _ONNX_FILE, CATEGORIES])  # order matters (ties)
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+    return os.path.join(_EMB_CACHE_DIR, f"skill_normalizer_categories_{digest}.pt")
+
+def _load_category_matrix():
+    if not _EMB_CACHE_DIR:
+        return None
+    try:
+        saved = torch.load(_category_matrix_path(), map_location="cpu", weights_only=True)
+        return saved["names"], saved["matrix"], saved["sizes"]
+    except Exception:
+        return None  # missing or unreadable: encode instead
+
+def _save_category_matrix(names, matrix, sizes):
+    if not _EMB_CACHE_DIR:
+        return
+    path = _category_matrix_path()
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        torch.save({"names": names, "matrix": matrix.cpu(), "sizes": sizes}, tmp)
+        os.replace(tmp, path)  # atomic: concurrent workers never read a partial file
+    except Exception as e:
+        print(f"⚠️ Could not save normalizer category embeddings: {e}")
+
+def _get_category_matrix():
+    global _category_matrix_cache
+    if _category_matrix_cache is None:
+        loaded = _load_category_matrix() if model is not None else None
+        if loaded is not None:
+            names, matrix, sizes = loaded
+            matrix = matrix.to(getattr(model, "device", "cpu"))
+        else:
+            names, blocks, sizes = [], [], []
+            for category, examples in CATEGORIES.items():
+                example_embeds = _get_category_embeddings(category, examples)
+                if example_embeds is None:
+                    continue
+                names.append(category)
+                blocks.append(example_embeds)
+                sizes.append(example_embeds.size(0))
+            if not names:
+                return [], None, None
+            matrix = torch.nn.functional.normalize(torch.cat(blocks), p=2, dim=1)
+            if len(names) == len(CATEGORIES):
+                _save_category_matrix(names, matrix, sizes)
+        row_category = torch.repeat_interleave(torch.arange(len(names), device=matrix.device),
+                                               torch.tensor(sizes, device=matrix.device))
+        _category_matrix_cache = (names, matrix, row_category)
+    return _category_matrix_cache
+
+# Skill embeddings keyed by lowercased skill: resume, JD and missing lists share most skills.
+# The encoder is uncased, so "Python" and "python" embed identically and share one entry.
+# LRU shared by the scoring threads, so every access goes through the lock.
+_skill_embedding_cache: "OrderedDict[str, torch.Tensor]" = OrderedDict()
+_skill_embedding_lock = threading.Lock()
+_SKILL_EMBEDDING_CACHE_MAX = 4096
+
+def _get_skill_embeddings(m, skills):
+    """Embeddings for the given skills, keyed as given (skills that fail to encode are left out)."""
+    keys = {s: s.lower() for s in skills}
+    found = {}
+    with _skill_embedding_lock:
+        for key in dict.fromkeys(keys.values()):
+            emb = _skill_embedding_cache.get(key)
+            if emb is not None:
+                _skill_embedding_cache.move_to_end(key)
+                found[key] = emb
+    new_keys = [key for key in dict.fromkeys(keys.values()) if key not in found]
+    if new_keys:
+        encoded = {}
+        try:
+            # Batch encode all new skills at once (much faster than one-by-one)
+            batch = m.encode(new_keys, convert_to_tensor=True, normalize_embeddings=True, show_progress_bar=False)
+            encoded.update(zip(new_keys, batch))
+        except Exception:
+            # Fallback to individual encoding if batch fails
+            for key in new_keys:
+                try:
+                    encoded[key] = m.encode(key, convert_to_tensor=True, normalize_embeddings=True)
+                except Exception:
+                    pass
+        found.update(encoded)
+        with _skill_embedding_lock:
+            for key, emb in encoded.items():
+                _skill_embedding_cache[key] = emb
+                _skill_embedding_cache.move_to_end(key)
+            # Evict least recently used entries one at a time instead of dropping the whole cache
+            while len(_skill_embedding_cache) > _SKILL_EMBEDDING_CACHE_MAX:
+                _skill_embedding_cache.popitem(last=False)
+    return {s: found[key] for s, key in keys.items() if key in found}
+
 # Expanded canonical categories
 CATEGORIES = {
     # Core programming
@@ -134,6 +258,27 @@ CATEGORIES = {
 
 }
 
+# Lowercased example -> first category listing it. The encoder is uncased, so a skill equal to an
+# example (ignoring case) embeds identically and scores 1.0 against it: no encode needed.
+_EXAMPLE_CATEGORY = {}
+for _cat, _examples in CATEGORIES.items():
+    for _ex in _examples:
+        _EXAMPLE_CATEGORY.setdefault(_ex.lower(), _cat)
+
+# Lowercased examples per category for the small-list string-match path (built once, not per call)
+_CATEGORY_EXAMPLES_LOWER = [
+    (cat, frozenset(ex.lower() for ex in examples), [ex.lower() for ex in examples if len(ex) > 2])
+    for cat, examples in CATEGORIES.items()
+]
+
+
+
+# Build (or load) the category matrix with the preloaded model, not on the first request
+if model is not None:
+    try:
+        _get_category_matrix()
+    except Exception as e:
+        print(f"⚠️ Could not pre-build normalizer category embeddings: {e}")
 
 
 def normalize_skills(raw_skills, threshold: float = 0.6):
@@ -144,13 +289,19 @@ def normalize_skills(raw_skills, threshold: float = 0.6):
     """
     if not raw_skills:
         return []
+    # Same skill list (e.g. a JD scored again) -> cached result, no encode
+    return list(_normalize_skills_cached(tuple(raw_skills), threshold))
+
+@functools.lru_cache(maxsize=256)
+def _normalize_skills_cached(raw_skills: tuple, threshold: float) -> tuple:
+    raw_skills = list(raw_skills)
     
     # Get model (should already be loaded)
     m = model if model is not None else get_normalizer_model()
     
     if m is None:
         # Fallback if model couldn't load
-        return [(skill, "other", 0.0) for skill in raw_skills]
+        return tuple((skill, "other", 0.0) for skill in raw_skills)
 
     # Fast path: For very small lists, use simple string matching (much faster)
     if len(raw_skills) <= 5:
@@ -161,58 +312,55 @@ def normalize_skills(raw_skills, threshold: float = 0.6):
             # Quick check: is it a known tech skill in any category?
             found_category = "other"
             best_match_score = 0.0
-            for cat, examples in CATEGORIES.items():
+            for cat, examples_set, partial_examples in _CATEGORY_EXAMPLES_LOWER:
                 # Check exact match first
-                if skill_lower in [ex.lower() for ex in examples]:
+                if skill_lower in examples_set:
                     found_category = cat
                     best_match_score = 0.9
                     break
-                # Check partial match
-                for ex in examples:
-                    if skill_lower in ex.lower() or ex.lower() in skill_lower:
-                        if len(ex) > 2:  # Avoid matching single letters
-                            found_category = cat
-                            best_match_score = 0.7
-                            break
+                # Check partial match (examples of 1-2 chars are left out: avoid matching single letters)
+                for ex in partial_examples:
+                    if skill_lower in ex or ex in skill_lower:
+                        found_category = cat
+                        best_match_score = 0.7
+                        break
                 if found_category != "other":
                     break
             results.append((skill, found_category, best_match_score))
-        return results
+        return tuple(results)
 
-    # Batch encode all skills at once (much faster than one-by-one)
-    try:
-        skill_embeds = model.encode(raw_skills, convert_to_tensor=True, show_progress_bar=False)
-    except Exception:
-        # Fallback to individual encoding if batch fails
-        skill_embeds = None
+    names, matrix, row_category = _get_category_matrix()
 
-    results = []
-    for idx, skill in enumerate(raw_skills):
-        try:
-            # Use batch embedding if available, otherwise encode individually
-            if skill_embeds is not None:
-                skill_embed = skill_embeds[idx:idx+1]  # Get single embedding from batch
-            else:
-                skill_embed = model.encode(skill, convert_to_tensor=True)
-        except Exception:
-            results.append((skill, "other", 0.0))
-            continue
-
-        best_match = "other"
-        best_score = 0.0
-        for category, examples in CATEGORIES.items():
-            # Use cached embeddings (much faster!)
-            example_embeds = _get_category_embeddings(category, examples)
-            if example_embeds is None:
-                continue
-            score = util.cos_sim(skill_embed, example_embeds).max().item()
-            if score > best_score:
-                best_score = score
-                best_match = category
+    # ⚡ Skills that are a category example resolve by lookup; only the rest are encoded
+    best = {}
+    if len(names) == len(CATEGORIES):
+        for skill in raw_skills:
+            cat = _EXAMPLE_CATEGORY.get(skill.lower())
+            if cat is not None:
+                best[skill] = (cat, 1.0)
+    to_encode = [skill for skill in raw_skills if skill not in best]
+    embeds = _get_skill_embeddings(m, to_encode) if to_encode else {}
+
+    # ⚡ One cosine matmul for every skill x every category example, then max per category
+    # (both sides are unit vectors, so the dot product is the cosine)
+    encoded = [skill for skill in dict.fromkeys(to_encode) if skill in embeds]
+    if encoded and names:
+        sims = torch.mm(torch.stack([embeds[skill] for skill in encoded]), matrix.T)
+        # Segmented max over each category's rows in one kernel (no Python loop over categories)
+        per_category = sims.new_full((sims.size(0), len(names)), float("-inf")).scatter_reduce_(
+            1, row_category.expand_as(sims), sims, reduce="amax")
+        best_idx = per_category.argmax(dim=1)  # first category wins ties, as in CATEGORIES order
+        best_scores = per_category.gather(1, best_idx.unsqueeze(1)).squeeze(1)
+        for skill, idx, score in zip(encoded, best_idx.tolist(), best_scores.tolist()):
+            if score > 0.0:
+                best[skill] = (names[idx], score)
 
+    results = []
+    for skill in raw_skills:
+        best_match, best_score = best.get(skill, ("other", 0.0))
         if best_score >= threshold:
             results.append((skill, best_match, round(best_score, 2)))
         else:
             results.append((skill, "other", round(best_score, 2)))
 
-    return results
+    return tuple(results)